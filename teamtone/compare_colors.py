@@ -4,12 +4,42 @@ Computes proximity/likeness between hex colors using various color distance metr
 """
 
 import math
-from typing import Tuple, Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 
+import numpy as np
 
+# sRGB (linear) to XYZ conversion matrix for the D65 illuminant
+_RGB_TO_XYZ = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+
+# D65 reference white point
+_D65_WHITE = np.array([0.95047, 1.00000, 1.08883])
+
+
+def _gamma_correct(channel: float) -> float:
+    """Apply sRGB gamma correction to a channel value normalized to 0-1"""
+    if channel <= 0.04045:
+        return channel / 12.92
+    else:
+        return ((channel + 0.055) / 1.055) ** 2.4
+
+
+# Gamma corrected value for every 8-bit channel value, indexed by 0-255
+_GAMMA_LUT = tuple(_gamma_correct(c / 255.0) for c in range(256))
+_GAMMA_LUT_NP = np.array(_GAMMA_LUT)
+
+
+@lru_cache(maxsize=8192)
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     """
     Convert hex color to RGB tuple.
+    Results are cached since the same team and palette colors repeat.
 
     Args:
         hex_color (str): Hex color string (with or without #)
@@ -17,11 +47,11 @@ def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     Returns:
         Tuple[int, int, int]: RGB values (0-255)
     """
-    # Remove # if present
-    hex_color = hex_color.lstrip("#")
+    # Remove # if present; multi-color values like "#000000,#0057B7" use the first
+    rgb = bytes.fromhex(hex_color.lstrip("#")[:6])
 
     # Convert to RGB
-    return tuple(int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+    return (rgb[0], rgb[1], rgb[2])
 
 
 def rgb_to_hex(r: int, g: int, b: int) -> str:
@@ -52,19 +82,16 @@ def rgb_to_lab(r: int, g: int, b: int) -> Tuple[float, float, float]:
     Returns:
         Tuple[float, float, float]: LAB values
     """
-    # Normalize RGB to 0-1
-    r, g, b = r / 255.0, g / 255.0, b / 255.0
+    return _rgb_to_lab_packed((r << 16) | (g << 8) | b)
 
-    # Apply sRGB gamma correction
-    def gamma_correct(channel):
-        if channel <= 0.04045:
-            return channel / 12.92
-        else:
-            return ((channel + 0.055) / 1.055) ** 2.4
 
-    r = gamma_correct(r)
-    g = gamma_correct(g)
-    b = gamma_correct(b)
+@lru_cache(maxsize=65536)
+def _rgb_to_lab_packed(packed: int) -> Tuple[float, float, float]:
+    """Convert an RGB color packed as 0xRRGGBB to LAB, caching repeated colors"""
+    r, g, b = (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF
+
+    # Normalize RGB to 0-1 and apply sRGB gamma correction
+    r, g, b = _GAMMA_LUT[r], _GAMMA_LUT[g], _GAMMA_LUT[b]
 
     # Convert to XYZ (using D65 illuminant)
     x = r * 0.4124564 + g * 0.3575761 + b * 0.1804375
@@ -91,6 +118,91 @@ def rgb_to_lab(r: int, g: int, b: int) -> Tuple[float, float, float]:
     return (L, a, b_lab)
 
 
+@lru_cache(maxsize=8192)
+def _hex_to_lab(hex_color: str) -> Tuple[float, float, float]:
+    """Convert a hex color to LAB, caching the result for repeated colors"""
+    return rgb_to_lab(*hex_to_rgb(hex_color))
+
+
+def rgb_to_lab_np(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of RGB colors to LAB color space in one vectorized pass.
+    Equivalent to calling rgb_to_lab() on every row.
+
+    Args:
+        rgb (np.ndarray): Array of shape (N, 3) with RGB values (0-255)
+
+    Returns:
+        np.ndarray: Array of shape (N, 3) with LAB values
+    """
+    rgb = np.asarray(rgb)
+
+    # Normalize RGB to 0-1 and apply sRGB gamma correction
+    if np.issubdtype(rgb.dtype, np.integer):
+        rgb = _GAMMA_LUT_NP[rgb]
+    else:
+        rgb = rgb.astype(np.float64) / 255.0
+        rgb = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+    # Convert to XYZ and normalize for D65 white point
+    xyz = (rgb @ _RGB_TO_XYZ.T) / _D65_WHITE
+
+    # Convert XYZ to LAB
+    delta = 6 / 29
+    f = np.where(xyz > delta**3, np.cbrt(xyz), xyz / (3 * delta**2) + 4 / 29)
+
+    L = 116 * f[:, 1] - 16
+    a = 500 * (f[:, 0] - f[:, 1])
+    b_lab = 200 * (f[:, 1] - f[:, 2])
+
+    return np.stack((L, a, b_lab), axis=1)
+
+
+@lru_cache(maxsize=32)
+def _palette_arrays(hex_colors: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a palette of hex colors once and cache it as arrays.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: RGB values packed as 0xRRGGBB ints and
+        the (N, 3) LAB values, in palette order
+    """
+    rgb = np.array([hex_to_rgb(hex_color) for hex_color in hex_colors], dtype=np.uint8)
+    packed = (
+        (rgb[:, 0].astype(np.uint32) << 16)
+        | (rgb[:, 1].astype(np.uint32) << 8)
+        | rgb[:, 2]
+    )
+    return packed, rgb_to_lab_np(rgb)
+
+
+def batched_delta_e(target_labs: np.ndarray, palette_labs: np.ndarray) -> np.ndarray:
+    """
+    Calculate Delta E (CIE76) between every target and every palette color.
+    Useful for matching several team colors against a large filament catalog.
+
+    Args:
+        target_labs (np.ndarray): Array of shape (M, 3) with LAB values
+        palette_labs (np.ndarray): Array of shape (N, 3) with LAB values
+
+    Returns:
+        np.ndarray: Array of shape (M, N) with Delta E values
+    """
+    target_labs = np.asarray(target_labs, dtype=np.float64).reshape(-1, 3)
+    palette_labs = np.asarray(palette_labs, dtype=np.float64).reshape(-1, 3)
+
+    delta = target_labs[:, np.newaxis, :] - palette_labs[np.newaxis, :, :]
+    distances = np.einsum("mnk,mnk->mn", delta, delta)
+    return np.sqrt(distances, out=distances)
+
+
+def _delta_e_batch(
+    target_lab: Tuple[float, float, float], palette_lab: np.ndarray
+) -> np.ndarray:
+    """Delta E (CIE76) from one LAB color to every row of an (N, 3) LAB array"""
+    return batched_delta_e(np.asarray(target_lab), palette_lab)[0]
+
+
 def euclidean_distance_rgb(hex1: str, hex2: str) -> float:
     """
     Calculate Euclidean distance between two colors in RGB space.
@@ -102,10 +214,15 @@ def euclidean_distance_rgb(hex1: str, hex2: str) -> float:
     Returns:
         float: Distance value (0-441.67, where 0 is identical)
     """
-    r1, g1, b1 = hex_to_rgb(hex1)
-    r2, g2, b2 = hex_to_rgb(hex2)
+    return _rgb_distance(hex_to_rgb(hex1), hex_to_rgb(hex2))
+
+
+def _rgb_distance(rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]) -> float:
+    """Euclidean distance between two already parsed RGB colors"""
+    r1, g1, b1 = rgb1
+    r2, g2, b2 = rgb2
 
-    return math.sqrt((r2 - r1) ** 2 + (g2 - g1) ** 2 + (b2 - b1) ** 2)
+    return math.hypot(r2 - r1, g2 - g1, b2 - b1)
 
 
 def weighted_rgb_distance(hex1: str, hex2: str) -> float:
@@ -120,8 +237,15 @@ def weighted_rgb_distance(hex1: str, hex2: str) -> float:
     Returns:
         float: Weighted distance value
     """
-    r1, g1, b1 = hex_to_rgb(hex1)
-    r2, g2, b2 = hex_to_rgb(hex2)
+    return _weighted_rgb_distance(hex_to_rgb(hex1), hex_to_rgb(hex2))
+
+
+def _weighted_rgb_distance(
+    rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]
+) -> float:
+    """Weighted RGB distance between two already parsed RGB colors"""
+    r1, g1, b1 = rgb1
+    r2, g2, b2 = rgb2
 
     # Calculate mean red
     r_mean = (r1 + r2) / 2
@@ -135,8 +259,11 @@ def weighted_rgb_distance(hex1: str, hex2: str) -> float:
     weight_g = 4.0
     weight_b = 2 + (255 - r_mean) / 256
 
-    return math.sqrt(
-        weight_r * delta_r**2 + weight_g * delta_g**2 + weight_b * delta_b**2
+    # sqrt(sum(w * d**2)) == hypot(sqrt(w) * d, ...)
+    return math.hypot(
+        math.sqrt(weight_r) * delta_r,
+        math.sqrt(weight_g) * delta_g,
+        math.sqrt(weight_b) * delta_b,
     )
 
 
@@ -159,17 +286,21 @@ def delta_e_cie76(hex1: str, hex2: str) -> float:
     Returns:
         float: Delta E value (lower is more similar)
     """
-    r1, g1, b1 = hex_to_rgb(hex1)
-    r2, g2, b2 = hex_to_rgb(hex2)
+    return _delta_e_from_lab(_hex_to_lab(hex1), _hex_to_lab(hex2))
+
 
-    L1, a1, b1_lab = rgb_to_lab(r1, g1, b1)
-    L2, a2, b2_lab = rgb_to_lab(r2, g2, b2)
+def _delta_e_from_lab(
+    lab1: Tuple[float, float, float], lab2: Tuple[float, float, float]
+) -> float:
+    """Delta E (CIE76) between two already converted LAB colors"""
+    L1, a1, b1_lab = lab1
+    L2, a2, b2_lab = lab2
 
     delta_L = L2 - L1
     delta_a = a2 - a1
     delta_b = b2_lab - b1_lab
 
-    return math.sqrt(delta_L**2 + delta_a**2 + delta_b**2)
+    return math.hypot(delta_L, delta_a, delta_b)
 
 
 def delta_e_cie94(hex1: str, hex2: str) -> float:
@@ -184,15 +315,19 @@ def delta_e_cie94(hex1: str, hex2: str) -> float:
     Returns:
         float: Delta E value (lower is more similar)
     """
-    r1, g1, b1 = hex_to_rgb(hex1)
-    r2, g2, b2 = hex_to_rgb(hex2)
+    return _delta_e94_from_lab(_hex_to_lab(hex1), _hex_to_lab(hex2))
 
-    L1, a1, b1_lab = rgb_to_lab(r1, g1, b1)
-    L2, a2, b2_lab = rgb_to_lab(r2, g2, b2)
+
+def _delta_e94_from_lab(
+    lab1: Tuple[float, float, float], lab2: Tuple[float, float, float]
+) -> float:
+    """Delta E (CIE94) between two already converted LAB colors"""
+    L1, a1, b1_lab = lab1
+    L2, a2, b2_lab = lab2
 
     delta_L = L1 - L2
-    C1 = math.sqrt(a1**2 + b1_lab**2)
-    C2 = math.sqrt(a2**2 + b2_lab**2)
+    C1 = math.hypot(a1, b1_lab)
+    C2 = math.hypot(a2, b2_lab)
     delta_C = C1 - C2
     delta_a = a1 - a2
     delta_b = b1_lab - b2_lab
@@ -209,15 +344,23 @@ def delta_e_cie94(hex1: str, hex2: str) -> float:
     SC = 1.0 + K1 * C1
     SH = 1.0 + K2 * C1
 
-    delta_e = math.sqrt(
-        (delta_L / (kL * SL)) ** 2
-        + (delta_C / (kC * SC)) ** 2
-        + (delta_H / (kH * SH)) ** 2
-    )
+    delta_e = math.hypot(delta_L / (kL * SL), delta_C / (kC * SC), delta_H / (kH * SH))
 
     return delta_e
 
 
+# Distance function and the distance treated as 0% similar, by method name
+_SIMILARITY_METHODS = {
+    # Delta E of 100 is very different, 0 is identical
+    "delta_e_cie76": (delta_e_cie76, 100.0),
+    "delta_e_cie94": (delta_e_cie94, 100.0),
+    # Max RGB distance is sqrt(255^2 + 255^2 + 255^2) ≈ 441.67
+    "rgb": (euclidean_distance_rgb, 441.67),
+    # Approximate max for weighted distance
+    "weighted_rgb": (weighted_rgb_distance, 765.0),
+}
+
+
 def color_similarity_percentage(
     hex1: str, hex2: str, method: str = "delta_e_cie76"
 ) -> float:
@@ -233,22 +376,12 @@ def color_similarity_percentage(
     Returns:
         float: Similarity percentage (0-100)
     """
-    if method == "delta_e_cie76":
-        distance = delta_e_cie76(hex1, hex2)
-        # Delta E of 100 is very different, 0 is identical
-        max_distance = 100.0
-    elif method == "delta_e_cie94":
-        distance = delta_e_cie94(hex1, hex2)
-        max_distance = 100.0
-    elif method == "rgb":
-        distance = euclidean_distance_rgb(hex1, hex2)
-        # Max RGB distance is sqrt(255^2 + 255^2 + 255^2) ≈ 441.67
-        max_distance = 441.67
-    elif method == "weighted_rgb":
-        distance = weighted_rgb_distance(hex1, hex2)
-        max_distance = 765.0  # Approximate max for weighted distance
-    else:
-        raise ValueError(f"Unknown method: {method}")
+    try:
+        distance_fn, max_distance = _SIMILARITY_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown method: {method}") from None
+
+    distance = distance_fn(hex1, hex2)
 
     # Convert distance to similarity percentage
     similarity = max(0, 100 * (1 - distance / max_distance))
@@ -266,14 +399,17 @@ def compare_colors(hex1: str, hex2: str) -> Dict[str, float]:
     Returns:
         Dict[str, float]: Dictionary with various distance metrics and similarity
     """
+    # Parse and convert each color once, then derive every metric from it
+    rgb1, rgb2 = hex_to_rgb(hex1), hex_to_rgb(hex2)
+    lab1, lab2 = _hex_to_lab(hex1), _hex_to_lab(hex2)
+    delta_e76 = _delta_e_from_lab(lab1, lab2)
+
     return {
-        "rgb_distance": euclidean_distance_rgb(hex1, hex2),
-        "weighted_rgb_distance": weighted_rgb_distance(hex1, hex2),
-        "delta_e_cie76": delta_e_cie76(hex1, hex2),
-        "delta_e_cie94": delta_e_cie94(hex1, hex2),
-        "similarity_percentage": color_similarity_percentage(
-            hex1, hex2, "delta_e_cie76"
-        ),
+        "rgb_distance": _rgb_distance(rgb1, rgb2),
+        "weighted_rgb_distance": _weighted_rgb_distance(rgb1, rgb2),
+        "delta_e_cie76": delta_e76,
+        "delta_e_cie94": _delta_e94_from_lab(lab1, lab2),
+        "similarity_percentage": max(0, 100 * (1 - delta_e76 / 100.0)),
     }
 
 
@@ -290,16 +426,64 @@ def find_closest_color(
     Returns:
         Tuple[str, str, float]: (name, hex, similarity_percentage) of closest match
     """
-    best_match = None
-    best_similarity = -1
+    if not color_list:
+        return None
+
+    palette_packed, palette_lab = _palette_arrays(
+        tuple(hex_color for _, hex_color in color_list)
+    )
+
+    # Nothing beats an exact RGB match, so skip the Delta E pass for it
+    r, g, b = hex_to_rgb(target_hex)
+    exact = np.flatnonzero(palette_packed == ((r << 16) | (g << 8) | b))
+    if exact.size:
+        name, hex_color = color_list[exact[0]]
+        return (name, hex_color, 100.0)
+
+    # Delta E (CIE76) from the target to every palette color at once
+    distances = _delta_e_batch(_hex_to_lab(target_hex), palette_lab)
+
+    best = int(np.argmin(distances))
+    name, hex_color = color_list[best]
+    similarity = max(0, 100 * (1 - float(distances[best]) / 100.0))
+
+    return (name, hex_color, similarity)
+
+
+def find_closest_colors(
+    target_hex: str, color_list: list[Tuple[str, str]], k: int = 10
+) -> list[Tuple[str, str, float]]:
+    """
+    Find the k closest colors from a list of colors, best match first.
+
+    Args:
+        target_hex (str): Target hex color to match
+        color_list (list): List of tuples (name, hex_color)
+        k (int): Maximum number of matches to return (default: 10)
+
+    Returns:
+        list[Tuple[str, str, float]]: (name, hex, similarity_percentage) tuples
+    """
+    if not color_list or k <= 0:
+        return []
+
+    _, palette_lab = _palette_arrays(tuple(hex_color for _, hex_color in color_list))
+    distances = _delta_e_batch(_hex_to_lab(target_hex), palette_lab)
+
+    # Select the k smallest distances without sorting the whole palette
+    if k < len(distances):
+        candidates = np.argpartition(distances, k - 1)[:k]
+    else:
+        candidates = np.arange(len(distances))
+    candidates = candidates[np.argsort(distances[candidates], kind="stable")]
 
-    for name, hex_color in color_list:
-        similarity = color_similarity_percentage(target_hex, hex_color)
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match = (name, hex_color, similarity)
+    results = []
+    for index in candidates:
+        name, hex_color = color_list[index]
+        similarity = max(0, 100 * (1 - float(distances[index]) / 100.0))
+        results.append((name, hex_color, similarity))
 
-    return best_match
+    return results
 
 
 # Example usage
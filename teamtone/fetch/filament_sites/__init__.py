@@ -1,7 +1,12 @@
 """Filament site scrapers package"""
 
-from .base import FilamentScraper
+from .base import FilamentScraper, fetch_all
 from .filamentprofiles import FilamentProfilesScraper
 from .polymaker import PolymakerScraper
 
-__all__ = ["FilamentScraper", "FilamentProfilesScraper", "PolymakerScraper"]
+__all__ = [
+    "FilamentProfilesScraper",
+    "FilamentScraper",
+    "PolymakerScraper",
+    "fetch_all",
+]
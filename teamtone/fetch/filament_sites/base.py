@@ -1,6 +1,7 @@
 """Base interface for filament site scrapers"""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 
@@ -79,3 +80,29 @@ class FilamentScraper(ABC):
             yaml_data[manufacturer][material][color] = color_data
 
         return yaml_data
+
+
+def fetch_all(scrapers: list[FilamentScraper], **kwargs) -> dict[str, dict[str, Any]]:
+    """
+    Fetch from several scrapers concurrently
+
+    Each scraper talks to an independent site, so their network waits (and
+    throttle delays) overlap instead of running back to back.
+
+    Args:
+        scrapers: Scraper instances to run
+        **kwargs: Keyword arguments passed to every scraper's fetch()
+
+    Returns:
+        Dictionary mapping each scraper's site_name to its fetch() result,
+        in the same order as scrapers
+    """
+    if not scrapers:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+        futures = [executor.submit(scraper.fetch, **kwargs) for scraper in scrapers]
+        return {
+            scraper.site_name: future.result()
+            for scraper, future in zip(scrapers, futures)
+        }
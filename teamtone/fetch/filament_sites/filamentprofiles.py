@@ -1,19 +1,48 @@
 """Scraper for 3dfilamentprofiles.com"""
 
+import json
+import re
 import sys
 import time
+from collections.abc import Iterator
 from typing import Any
 
 try:
     import requests
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+    from urllib3.util.request import ACCEPT_ENCODING
 except ImportError:
     print("Error: Required packages not installed.")
     print("Install with: pip install requests beautifulsoup4")
     sys.exit(1)
 
+# Prefer the C-based lxml parser when it's installed
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
 from .base import FilamentScraper
 
+# The JSON is escaped, so we need to match: \\"brand_name\\":\\"value\\"
+# Pattern matches entire JSON objects to extract all fields
+_FILAMENT_RE = re.compile(
+    r'\{\\"id\\":\d+[^}]*\\"brand_name\\":\\"([^"\\]+)\\"[^}]*\\"material\\":\\"([^"\\]+)\\"[^}]*\\"material_type\\":\\"([^"\\]*)\\"[^}]*\\"color\\":\\"([^"\\]+)\\"[^}]*\\"rgb\\":\\"([^"\\]+)\\"[^}]*\}',
+    re.ASCII,
+)
+_WEBSITE_RE = re.compile(r'\\"website\\":\\"(https?://[^"\\]+)\\"', re.ASCII)
+_ASIN_RE = re.compile(r'\\"price_data\\":\{\\"bad\\":\\"([^"\\]+)\\"', re.ASCII)
+
+# Marker for script tags that carry filament data
+_BRAND_RE = re.compile(r"brand_name")
+
+# Opening script tags, scanned straight from the response bytes
+_SCRIPT_OPEN_RE = re.compile(rb"<script[^>]*>")
+
 
 class FilamentProfilesScraper(FilamentScraper):
     """Scraper for 3dfilamentprofiles.com"""
@@ -68,51 +97,32 @@ class FilamentProfilesScraper(FilamentScraper):
             "User-Agent": self.USER_AGENT,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate" if not fetch_only else "identity",
+            # Every encoding urllib3 can decode here (adds br/zstd when installed)
+            "Accept-Encoding": ACCEPT_ENCODING,
             "DNT": "1",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
         }
 
-        # Fetch with retry logic for 429 errors
-        response = None
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                # Add delay before request (except first attempt)
-                if attempt > 0:
-                    wait_time = self.RETRY_DELAY * attempt
-                    print(
-                        f"Retry {attempt}/{self.MAX_RETRIES - 1} after {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
-                elif delay > 0:
-                    time.sleep(delay)
-
-                response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
-                break  # Success, exit retry loop
-
-            except requests.exceptions.HTTPError as e:
-                if response and response.status_code == 429:
-                    if attempt < self.MAX_RETRIES - 1:
-                        print("Rate limited (429). Retrying...")
-                        continue
-                    else:
-                        print(f"Rate limited after {self.MAX_RETRIES} attempts.")
-                        print(
-                            "Try again later or increase the delay with --delay parameter."
-                        )
-                        sys.exit(1)
-                else:
-                    print(f"HTTP Error: {e}")
-                    sys.exit(1)
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching data: {e}")
-                sys.exit(1)
-
-        if response is None:
-            print("Failed to fetch data after retries")
+        # Polite throttle; 429/503 retries and backoff are handled by _SESSION
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            response = _SESSION.get(url, headers=headers, timeout=30)
+            response.raise_for_status()
+
+        except requests.exceptions.RetryError as e:
+            print(f"Rate limited after {self.MAX_RETRIES} attempts: {e}")
+            print("Try again later or increase the delay with --delay parameter.")
+            sys.exit(1)
+
+        except requests.exceptions.HTTPError as e:
+            print(f"HTTP Error: {e}")
+            sys.exit(1)
+
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching data: {e}")
             sys.exit(1)
 
         # If fetch_only mode, return raw HTML without parsing
@@ -131,23 +141,30 @@ class FilamentProfilesScraper(FilamentScraper):
                 "source_url": url,
                 "source_name": self.site_name,
                 "raw_html": response.text,
-                "raw_html_length": len(response.text),
+                "raw_html_length": len(response.content),
                 "encoding": detected_encoding,
                 "content_type": content_type,
             }
 
-        # Parse the HTML
-        soup = BeautifulSoup(response.content, "html.parser")
-
         filaments_data = {
             "source_url": url,
             "source_name": self.site_name,
-            "raw_html_length": len(response.text),
+            "raw_html_length": len(response.content),
             "filaments": [],
         }
 
-        # Extract JSON data from Next.js script tag
-        filaments_data["filaments"] = self._parse_filaments(soup)
+        # Extract JSON data from Next.js script tag, skipping pages without it
+        if b"brand_name" in response.content:
+            filaments_data["filaments"] = self._parse_filaments_from_html(
+                response.content
+            )
+
+            if not filaments_data["filaments"]:
+                # Fall back to a real HTML parse if the script scan missed it
+                soup = BeautifulSoup(
+                    response.content, _HTML_PARSER, parse_only=SoupStrainer("script")
+                )
+                filaments_data["filaments"] = self._parse_filaments(soup)
 
         if not filaments_data["filaments"]:
             print("Warning: No filaments found. The page structure may have changed.")
@@ -163,9 +180,11 @@ class FilamentProfilesScraper(FilamentScraper):
         """
         Extract filament data from Next.js JSON embedded in script tags
 
-        The site is a client-side rendered React app with data embedded in
-        a script tag. The JSON is escaped with backslashes, so quotes appear
-        as \\" instead of ".
+        The site is a client-side rendered React app with data streamed in
+        self.__next_f.push([1, "..."]) script tags. The pushed string holds
+        rows of "<id>:<json>", so it is decoded with json instead of being
+        scanned with a regex. The regex scan is kept as a fallback for pages
+        that don't follow this layout.
 
         Args:
             soup: BeautifulSoup object of the page
@@ -173,81 +192,268 @@ class FilamentProfilesScraper(FilamentScraper):
         Returns:
             List of filament dictionaries
         """
-        import re
+        # Let BeautifulSoup skip script tags without filament data
+        for script in soup.find_all("script", string=_BRAND_RE):
+            filaments = self._parse_filaments_from_text(script.string)
 
-        filaments = []
+            # If we found filaments, we're done
+            if filaments:
+                return filaments
+
+        return []
+
+    def _parse_filaments_from_html(self, content: bytes) -> list[dict[str, Any]]:
+        """
+        Extract filament data by scanning the raw page for inline scripts
 
-        # Find all script tags
-        scripts = soup.find_all("script")
+        Avoids building a DOM for the whole page when only script bodies are
+        needed. Script contents aren't entity-decoded by HTML parsers, so the
+        raw bytes match what BeautifulSoup would return.
 
-        for script in scripts:
-            script_text = script.string if script.string else ""
+        Args:
+            content: Raw HTML bytes of the page
 
-            # Look for JSON objects with filament data (escaped format)
-            if (
-                "brand_name" in script_text
-                and "material" in script_text
-                and "rgb" in script_text
+        Returns:
+            List of filament dictionaries, empty if no script held filament data
+        """
+        position = 0
+        while match := _SCRIPT_OPEN_RE.search(content, position):
+            # Script bodies can't contain </script>, so find the end directly
+            end = content.find(b"</script>", match.end())
+            if end == -1:
+                break
+            block = content[match.end() : end]
+            position = end
+
+            if b"brand_name" not in block:
+                continue
+
+            filaments = self._parse_filaments_from_text(
+                block.decode("utf-8", errors="replace")
+            )
+            if filaments:
+                return filaments
+
+        return []
+
+    def _parse_filaments_from_text(self, script_text: str) -> list[dict[str, Any]]:
+        """
+        Extract filament data from the text of a single script tag
+
+        Args:
+            script_text: Contents of a script tag
+
+        Returns:
+            List of filament dictionaries, empty if the script has none
+        """
+        # Look for JSON objects with filament data (escaped format)
+        if not (
+            "brand_name" in script_text
+            and "material" in script_text
+            and "rgb" in script_text
+        ):
+            return []
+
+        try:
+            filaments = []
+            for record in self._extract_filament_records(script_text):
+                filament = self._record_to_filament(record)
+                if filament:
+                    filaments.append(filament)
+
+            if not filaments:
+                filaments = self._parse_filaments_regex(script_text)
+
+            return filaments
+
+        except (ValueError, AttributeError) as e:
+            print(f"Error parsing filament data: {e}")
+            return []
+
+    def _extract_filament_records(self, script_text: str) -> list[dict[str, Any]]:
+        """
+        Decode a Next.js push script and return every object with a brand_name
+
+        Args:
+            script_text: Contents of a self.__next_f.push([...]) script tag
+
+        Returns:
+            List of raw filament records, empty if the script can't be decoded
+        """
+        start = script_text.find("[")
+        end = script_text.rfind("]")
+        if start == -1 or end < start:
+            return []
+
+        # The push argument is itself valid JSON: [1, "<rows>"]
+        try:
+            chunk = json.loads(script_text[start : end + 1])
+        except ValueError:
+            return []
+
+        if not (isinstance(chunk, list) and len(chunk) > 1):
+            return []
+        if not isinstance(chunk[1], str):
+            return []
+
+        records = []
+        for row in chunk[1].splitlines():
+            # Rows look like "60:[...]"; rows that aren't plain JSON are skipped
+            _, sep, row_json = row.partition(":")
+            if not sep:
+                continue
+            try:
+                row_data = json.loads(row_json)
+            except ValueError:
+                continue
+            records.extend(_iter_brand_records(row_data))
+
+        return records
+
+    def _record_to_filament(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Convert a decoded filament record to the scraper's filament format"""
+        brand_name = record.get("brand_name")
+        material = record.get("material")
+        material_type = record.get("material_type") or ""
+        color = record.get("color")
+        rgb = record.get("rgb")
+
+        if not all(
+            isinstance(value, str) and value
+            for value in (brand_name, material, color, rgb)
+        ):
+            return None
+
+        # Skip manufacturers that have dedicated scrapers
+        if brand_name.lower() == "polymaker":
+            return None
+
+        filament = {
+            "manufacturer": brand_name,
+            "material": material,
+            "color": color,
+            "hex": rgb,
+        }
+
+        # Add material_type if it's meaningful
+        if isinstance(material_type, str) and material_type not in (
+            "",
+            "-- Other --",
+            "null",
+        ):
+            # Combine material with type for richer info
+            filament["material"] = f"{material} {material_type}"
+
+        # Website URL is the primary source for a purchase link
+        website = record.get("website")
+        if isinstance(website, str) and website.startswith(("http://", "https://")):
+            filament["link"] = website
+        else:
+            # Amazon ASIN from price_data as fallback
+            price_data = record.get("price_data")
+            if isinstance(price_data, dict) and price_data.get("bad"):
+                filament["link"] = f"https://www.amazon.com/dp/{price_data['bad']}"
+
+        return filament
+
+    def _parse_filaments_regex(self, script_text: str) -> list[dict[str, Any]]:
+        """
+        Fallback extraction that scans escaped JSON objects with a regex
+
+        The JSON is escaped with backslashes, so quotes appear as \\" instead
+        of ".
+
+        Args:
+            script_text: Contents of a script tag
+
+        Returns:
+            List of filament dictionaries
+        """
+        filaments = []
+
+        for match in _FILAMENT_RE.finditer(script_text):
+            full_match = match.group(0)
+            brand_name = match.group(1)
+            material = match.group(2)
+            material_type = match.group(3)
+            color = match.group(4)
+            rgb = match.group(5)
+
+            # Skip manufacturers that have dedicated scrapers
+            if brand_name.lower() == "polymaker":
+                continue
+
+            filament = {
+                "manufacturer": brand_name,
+                "material": material,
+                "color": color,
+                "hex": rgb,
+            }
+
+            # Add material_type if it's meaningful
+            if material_type and material_type not in (
+                "",
+                "-- Other --",
+                "null",
             ):
-                try:
-                    # The JSON is escaped, so we need to match: \\"brand_name\\":\\"value\\"
-                    # Pattern matches entire JSON objects to extract all fields
-                    pattern = r'\{\\"id\\":\d+[^}]*\\"brand_name\\":\\"([^"\\]+)\\"[^}]*\\"material\\":\\"([^"\\]+)\\"[^}]*\\"material_type\\":\\"([^"\\]*)\\"[^}]*\\"color\\":\\"([^"\\]+)\\"[^}]*\\"rgb\\":\\"([^"\\]+)\\"[^}]*\}'
-
-                    matches = re.finditer(pattern, script_text)
-
-                    for match in matches:
-                        full_match = match.group(0)
-                        brand_name = match.group(1)
-                        material = match.group(2)
-                        material_type = match.group(3)
-                        color = match.group(4)
-                        rgb = match.group(5)
-
-                        # Skip manufacturers that have dedicated scrapers
-                        if brand_name.lower() == "polymaker":
-                            continue
-
-                        filament = {
-                            "manufacturer": brand_name,
-                            "material": material,
-                            "color": color,
-                            "hex": rgb,
-                        }
-
-                        # Add material_type if it's meaningful
-                        if material_type and material_type not in (
-                            "",
-                            "-- Other --",
-                            "null",
-                        ):
-                            # Combine material with type for richer info
-                            filament["material"] = f"{material} {material_type}"
-
-                        # Extract website URL if present (primary source)
-                        website_match = re.search(
-                            r'\\"website\\":\\"(https?://[^"\\]+)\\"', full_match
-                        )
-                        if website_match:
-                            filament["link"] = website_match.group(1)
-                        else:
-                            # Extract Amazon ASIN from price_data as fallback
-                            price_data_match = re.search(
-                                r'\\"price_data\\":\{\\"bad\\":\\"([^"\\]+)\\"',
-                                full_match,
-                            )
-                            if price_data_match:
-                                asin = price_data_match.group(1)
-                                filament["link"] = f"https://www.amazon.com/dp/{asin}"
-
-                        filaments.append(filament)
-
-                    # If we found filaments, we're done
-                    if filaments:
-                        break
-
-                except (ValueError, AttributeError) as e:
-                    print(f"Error parsing filament data: {e}")
-                    continue
+                # Combine material with type for richer info
+                filament["material"] = f"{material} {material_type}"
+
+            # Extract website URL if present (primary source)
+            website_match = _WEBSITE_RE.search(full_match)
+            if website_match:
+                filament["link"] = website_match.group(1)
+            else:
+                # Extract Amazon ASIN from price_data as fallback
+                price_data_match = _ASIN_RE.search(full_match)
+                if price_data_match:
+                    asin = price_data_match.group(1)
+                    filament["link"] = f"https://www.amazon.com/dp/{asin}"
+
+            filaments.append(filament)
 
         return filaments
+
+
+class _RateLimitRetry(Retry):
+    """Retry whose first backoff is backoff_factor rather than zero"""
+
+    def get_backoff_time(self) -> float:
+        # urllib3 2.x skips the wait before the first retry, which would
+        # re-request a rate limited page immediately
+        backoff = super().get_backoff_time()
+        if self.history:
+            backoff = max(backoff, min(self.backoff_max, self.backoff_factor))
+        return backoff
+
+
+# Shared session so repeated fetches reuse the TCP/TLS connection. Rate limit
+# responses are retried by urllib3, honoring the server's Retry-After header
+# and otherwise waiting RETRY_DELAY, then doubling it for each further retry.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=_RateLimitRetry(
+            total=FilamentProfilesScraper.MAX_RETRIES - 1,
+            backoff_factor=FilamentProfilesScraper.RETRY_DELAY,
+            status_forcelist=[429, 503],
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
+
+def _iter_brand_records(node: Any) -> Iterator[dict[str, Any]]:
+    """Yield every dict carrying a brand_name key, in document order"""
+    if isinstance(node, dict):
+        if "brand_name" in node:
+            yield node
+            return
+        for value in node.values():
+            yield from _iter_brand_records(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_brand_records(item)
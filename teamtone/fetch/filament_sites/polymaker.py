@@ -1,14 +1,27 @@
 """Scraper for us.polymaker.com"""
 
+import hashlib
+import json
+import os
+import random
 import re
 import sys
+import threading
 import time
 import warnings
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
+from xml.etree import ElementTree
 
 try:
     import requests
     from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
 
     # Suppress XML parsed as HTML warning when lxml not available
     warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
@@ -17,8 +30,83 @@ except ImportError:
     print("Install with: pip install requests beautifulsoup4")
     sys.exit(1)
 
+# Prefer the faster orjson decoder for product JSON when it's installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from .base import FilamentScraper
 
+# Known non-filament products, matched anywhere in the lowercased URL
+_EXCLUDE_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "polybox",
+                "polydryer",
+                "nebulizer",
+                "gift-card",
+                "sample-box",
+                "creator-spool",
+                "bundle",
+                "pack",
+            ),
+        )
+    )
+)
+
+# Title keywords mapped to material types, in priority order
+_MATERIAL_PATTERNS = (
+    ("PLA", "PLA"),
+    ("PETG", "PETG"),
+    ("ABS", "ABS"),
+    ("ASA", "ASA"),
+    ("TPU", "TPU"),
+    ("PC", "PC"),
+    ("COPA", "PA"),
+    ("PA12", "PA12"),
+    ("PA6", "PA6"),
+    ("PA612", "PA612"),
+    ("PPS", "PPS"),
+    ("PET", "PET"),
+    ("PBT", "PBT"),
+)
+_MATERIALS = dict(_MATERIAL_PATTERNS)
+_MATERIAL_PRIORITY = {pattern: i for i, (pattern, _) in enumerate(_MATERIAL_PATTERNS)}
+
+# All keywords in one pass; longest first so e.g. PA612 isn't read as PA6.
+# No word boundaries, since titles like "TPU95" must still match TPU
+_MATERIAL_RE = re.compile(
+    "|".join(
+        sorted((pattern for pattern, _ in _MATERIAL_PATTERNS), key=len, reverse=True)
+    )
+)
+
+
+# The two helpers below are pure functions of one string over the tables above,
+# so they're memoized across products and scrapers. Each cache is bounded and
+# only holds short strings, so it can live as long as the module
+@lru_cache(maxsize=4096)
+def _is_filament_url(url: str) -> bool:
+    """Check if URL is likely a filament product (not accessories)"""
+    # Exclude known non-filament products
+    return _EXCLUDE_RE.search(url.lower()) is None
+
+
+@lru_cache(maxsize=4096)
+def _material_type(product_title: str) -> str:
+    """Extract material type from product title"""
+    matches = _MATERIAL_RE.findall(product_title.upper())
+    if not matches:
+        return "PLA"  # Default to PLA for Polymaker products
+
+    # Several keywords can appear in one title; the earliest listed wins
+    return _MATERIALS[min(matches, key=_MATERIAL_PRIORITY.__getitem__)]
+
 
 class PolymakerScraper(FilamentScraper):
     """Scraper for us.polymaker.com Shopify store"""
@@ -33,6 +121,50 @@ class PolymakerScraper(FilamentScraper):
     MAX_RETRIES = 3
     RETRY_DELAY = 5.0
 
+    # Default number of product pages fetched in parallel
+    DEFAULT_CONCURRENCY = 8
+
+    # How long cached responses are reused without revalidating (seconds)
+    CACHE_TTL = 24 * 60 * 60
+    SITEMAP_CACHE_TTL = 60 * 60
+
+    # Bytes read per step when streaming a sitemap into the XML parser
+    SITEMAP_CHUNK_SIZE = 64 * 1024
+
+    # Variant IDs (14+ digit numbers) followed by their metafield hex_code.
+    # Patterns are bytes so raw response bodies can be scanned without decoding
+    _VARIANT_HEX_RE = re.compile(
+        rb'"(\d{14,})"[^}]*?"hex_code"[:\s]*"(#?[0-9A-Fa-f]{6})"'
+    )
+
+    # Opening tags of the product JSON that Shopify themes inline in the page,
+    # e.g. <script type="application/json" id="ProductJson-product-template">
+    _PRODUCT_JSON_TAG_RE = re.compile(
+        rb'<script[^>]*(?:id="ProductJson-[^"]*"|data-product-json)[^>]*>'
+    )
+
+    # Hex code patterns for a product page, tried in order. They run against
+    # the lowercased page, so they are case-sensitive and start with a literal,
+    # which lets the regex engine jump between candidates instead of trying
+    # every position
+    _HEX_PAGE_RES = tuple(
+        re.compile(pattern)
+        for pattern in (
+            # "Hex Code: #XXXXXX" or "HEX Code: #XXXXXX"
+            rb"hex\s*code[:\s]+#?([0-9a-f]{6})",
+            rb"hex[:\s]+#?([0-9a-f]{6})",
+            rb'"hex_code"[:\s]+"#?([0-9a-f]{6})"',
+            rb'"hexcode"[:\s]+"#?([0-9a-f]{6})"',
+            rb"color[_-]?hex[:\s]+#?([0-9a-f]{6})",
+        )
+    )
+
+    # "Hex Code: #XXXXXX" stated in a product's own description
+    _DESCRIPTION_HEX_RE = re.compile(r"hex\s*code[:\s]+#?([0-9a-f]{6})", re.IGNORECASE)
+
+    # Variant title parts that describe size or weight rather than color
+    _SIZE_PARTS = frozenset({"1.75mm", "2.85mm", "1kg", "3kg", "Default Title"})
+
     # Products sitemap URL (with required params from main sitemap)
     SITEMAP_URL = "https://us.polymaker.com/sitemap_products_1.xml?from=6616970690617&to=8101790285881"
 
@@ -44,14 +176,56 @@ class PolymakerScraper(FilamentScraper):
     def site_url(self) -> str:
         return "https://us.polymaker.com"
 
-    def _get_session(self) -> requests.Session:
+    def __init__(self):
+        # Shared throttle so concurrent workers still space out their requests
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+        # Optional on-disk response cache, set per fetch() call
+        self._cache_dir = None
+
+        # One keep-alive session shared by every worker, built on first use
+        self._session = None
+        self._pool_size = self.DEFAULT_CONCURRENCY
+
+    @property
+    def session(self) -> requests.Session:
+        """Shared session, created lazily so its connection pool is reused"""
+        if self._session is None:
+            self._session = self._get_session(self._pool_size)
+        return self._session
+
+    def _wait_for_slot(self, delay: float) -> None:
+        """Block until this request may start, keeping starts `delay` seconds apart"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at)
+            self._next_request_at = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+    def _get_session(self, pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
         """Create a requests session with appropriate headers"""
         session = requests.Session()
+        # Keep-alive pool with one connection per in-flight request, shared by
+        # http and https; retries are handled by _fetch_with_retry. Blocking
+        # makes pool_size a hard cap on sockets to the origin: extra requests
+        # wait for a warm connection instead of opening throwaway ones
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=0,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         session.headers.update(
             {
                 "User-Agent": self.USER_AGENT,
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "en-US,en;q=0.5",
+                # Every encoding urllib3 can decode here (adds br/zstd when installed)
+                "Accept-Encoding": ACCEPT_ENCODING,
                 "DNT": "1",
                 "Connection": "keep-alive",
                 "Upgrade-Insecure-Requests": "1",
@@ -59,34 +233,126 @@ class PolymakerScraper(FilamentScraper):
         )
         return session
 
+    def _cache_paths(self, url: str) -> tuple[Path, Path]:
+        """Get the metadata and body cache file paths for a URL"""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{key}.json", self._cache_dir / f"{key}.body"
+
+    def _load_cached(self, url: str) -> tuple[dict[str, Any], bytes] | None:
+        """Load a cached response's metadata and body, if present"""
+        meta_path, body_path = self._cache_paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def _store_cached(self, url: str, response: requests.Response) -> None:
+        """Save a response's body and validators to the cache"""
+        meta = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+        }
+        meta_path, body_path = self._cache_paths(url)
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file via a temp file and rename so readers never see partial data"""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _touch_cached(self, url: str, meta: dict[str, Any]) -> None:
+        """Mark a cached response as freshly validated"""
+        meta_path, _ = self._cache_paths(url)
+        meta = {**meta, "fetched_at": time.time()}
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _cached_response(
+        self, url: str, meta: dict[str, Any], body: bytes
+    ) -> requests.Response:
+        """Build a Response object from a cache entry"""
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = body
+        response.encoding = meta.get("encoding")
+        # The body is already in memory, so iter_content() serves it directly
+        response._content_consumed = True
+        if meta.get("content_type"):
+            response.headers["Content-Type"] = meta["content_type"]
+        return response
+
     def _fetch_with_retry(
-        self, session: requests.Session, url: str, delay: float
+        self, session: requests.Session, url: str, delay: float, stream: bool = False
     ) -> requests.Response | None:
-        """Fetch URL with retry logic for rate limiting"""
-        for attempt in range(self.MAX_RETRIES):
+        """
+        Fetch URL with retry logic for rate limiting
+
+        With stream=True the body is left unread (unless it is being cached) so
+        the caller can consume it with iter_content() and must close() it.
+        """
+        cached = None
+        headers = {}
+        if self._cache_dir is not None:
+            cached = self._load_cached(url)
+            if cached:
+                meta, body = cached
+                ttl = self.SITEMAP_CACHE_TTL if "sitemap" in url else self.CACHE_TTL
+                if time.time() - meta.get("fetched_at", 0) < ttl:
+                    return self._cached_response(url, meta, body)
+
+                # Stale: ask the server whether our copy is still current
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+        # Retries sleep only for the backoff; the regular delay is for first tries
+        if delay > 0:
+            self._wait_for_slot(delay)
+
+        attempt = 0
+        while attempt < self.MAX_RETRIES:
             try:
-                if attempt > 0:
-                    wait_time = self.RETRY_DELAY * attempt
-                    print(f"Retry {attempt}/{self.MAX_RETRIES - 1} after {wait_time}s...")
+                response = session.get(url, headers=headers, timeout=30, stream=stream)
+                if not response.ok:
+                    # Hand an unread streamed connection back to the pool
+                    response.close()
+
+                if response.status_code == 429:
+                    attempt += 1
+                    if attempt == self.MAX_RETRIES:
+                        print(f"Rate limited after {self.MAX_RETRIES} attempts.")
+                        return None
+                    wait_time = self._retry_wait(response, attempt)
+                    print(
+                        f"Rate limited (429). Retry {attempt}/{self.MAX_RETRIES - 1}"
+                        f" after {wait_time:.1f}s..."
+                    )
                     time.sleep(wait_time)
-                elif delay > 0:
-                    time.sleep(delay)
+                    continue
 
-                response = session.get(url, timeout=30)
                 response.raise_for_status()
+
+                if cached and response.status_code == 304:
+                    # Hand the unread revalidation response back to the pool
+                    response.close()
+                    self._touch_cached(url, cached[0])
+                    return self._cached_response(url, *cached)
+                if self._cache_dir is not None:
+                    self._store_cached(url, response)
                 return response
 
             except requests.exceptions.HTTPError as e:
-                if response and response.status_code == 429:
-                    if attempt < self.MAX_RETRIES - 1:
-                        print("Rate limited (429). Retrying...")
-                        continue
-                    else:
-                        print(f"Rate limited after {self.MAX_RETRIES} attempts.")
-                        return None
-                else:
-                    print(f"HTTP Error for {url}: {e}")
-                    return None
+                print(f"HTTP Error for {url}: {e}")
+                return None
 
             except requests.exceptions.RequestException as e:
                 print(f"Error fetching {url}: {e}")
@@ -94,89 +360,150 @@ class PolymakerScraper(FilamentScraper):
 
         return None
 
+    def _retry_wait(self, response: requests.Response, attempt: int) -> float:
+        """
+        Get how long to wait before retrying a rate-limited request
+
+        Honors the server's Retry-After header (seconds or an HTTP date), else
+        backs off exponentially with jitter. The shared throttle is pushed back
+        by the same amount so other workers don't keep hitting the limit.
+        """
+        wait_time = None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                wait_time = float(retry_after)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    wait_time = retry_at.timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+
+        if wait_time is None:
+            wait_time = self.RETRY_DELAY * 2 ** (attempt - 1) * random.uniform(1, 1.5)
+        wait_time = max(wait_time, 0.0)
+
+        with self._throttle_lock:
+            self._next_request_at = max(
+                self._next_request_at, time.monotonic() + wait_time
+            )
+        return wait_time
+
     def _get_product_urls(self, session: requests.Session) -> list[str]:
         """Get all product URLs from sitemap"""
         print("Fetching product sitemap...")
-        response = self._fetch_with_retry(session, self.SITEMAP_URL, 0)
+        response = self._fetch_with_retry(session, self.SITEMAP_URL, 0, stream=True)
         if not response:
             # Fallback: try the main sitemap to find products sitemap
             main_sitemap = self._fetch_with_retry(
                 session, f"{self.site_url}/sitemap.xml", 0
             )
             if main_sitemap:
-                try:
-                    soup = BeautifulSoup(main_sitemap.content, "xml")
-                except Exception:
-                    soup = BeautifulSoup(main_sitemap.content, "html.parser")
-                for loc in soup.find_all("loc"):
-                    if "sitemap_products" in loc.text:
-                        response = self._fetch_with_retry(session, loc.text, 0.5)
+                for loc in self._iter_sitemap_locs(main_sitemap.content, "sitemap"):
+                    if "sitemap_products" in loc:
+                        response = self._fetch_with_retry(
+                            session, loc, 0.5, stream=True
+                        )
                         break
 
         if not response:
             print("Error: Could not fetch product sitemap")
             return []
 
-        # Use html.parser as fallback if lxml not installed
+        # Parse and filter while the body is still arriving instead of buffering it
         try:
-            soup = BeautifulSoup(response.content, "xml")
-        except Exception:
-            soup = BeautifulSoup(response.content, "html.parser")
-        urls = []
-
-        for url_tag in soup.find_all("url"):
-            loc = url_tag.find("loc")
-            if loc and "/products/" in loc.text:
-                # Filter out non-filament products
-                product_url = loc.text
-                if self._is_filament_product(product_url):
-                    urls.append(product_url)
+            urls = self._filter_product_urls(
+                self._stream_sitemap_locs(
+                    response.iter_content(self.SITEMAP_CHUNK_SIZE), "url"
+                )
+            )
+        except ElementTree.ParseError:
+            # Not well-formed XML; refetch the whole body for the lenient parser
+            response.close()
+            response = self._fetch_with_retry(session, response.url, 0)
+            locs = self._iter_sitemap_locs(response.content, "url") if response else []
+            urls = self._filter_product_urls(locs)
+        finally:
+            if response:
+                response.close()
 
         print(f"Found {len(urls)} filament product URLs")
         return urls
 
+    def _filter_product_urls(self, locs: Iterable[str]) -> list[str]:
+        """Keep the filament product pages from a sitemap's locations"""
+        return [
+            loc
+            for loc in locs
+            if "/products/" in loc and self._is_filament_product(loc)
+        ]
+
+    def _stream_sitemap_locs(
+        self, chunks: Iterable[bytes], entry_tag: str
+    ) -> Iterator[str]:
+        """
+        Yield the <loc> of every entry in a sitemap, parsing it chunk by chunk
+
+        Args:
+            chunks: Raw sitemap XML, e.g. from response.iter_content()
+            entry_tag: Entry element holding a <loc>, "url" or "sitemap"
+
+        Yields:
+            Locations in document order, as soon as each entry is complete
+
+        Raises:
+            ElementTree.ParseError: If the sitemap is not well-formed XML
+        """
+        parser = ElementTree.XMLPullParser(events=("end",))
+
+        def collect():
+            for _, elem in parser.read_events():
+                # Tags are namespaced, e.g. "{http://www.sitemaps.org/...}url"
+                if elem.tag.rpartition("}")[2] == entry_tag:
+                    loc = elem.findtext("{*}loc")
+                    if loc:
+                        yield loc
+                    # Free entries as they're consumed
+                    elem.clear()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from collect()
+        parser.close()
+        yield from collect()
+
+    def _iter_sitemap_locs(self, content: bytes, entry_tag: str) -> list[str]:
+        """
+        Get the <loc> of every entry in a sitemap, streaming the XML
+
+        Args:
+            content: Raw sitemap XML
+            entry_tag: Entry element holding a <loc>, "url" or "sitemap"
+
+        Returns:
+            List of locations in document order
+        """
+        try:
+            locs = list(self._stream_sitemap_locs((content,), entry_tag))
+        except ElementTree.ParseError:
+            # Not well-formed XML, fall back to the lenient HTML parser
+            soup = BeautifulSoup(content, "html.parser")
+            locs = []
+            for tag in soup.find_all(entry_tag):
+                loc = tag.find("loc")
+                if loc and loc.text:
+                    locs.append(loc.text)
+
+        return locs
+
     def _is_filament_product(self, url: str) -> bool:
         """Check if URL is likely a filament product (not accessories)"""
-        # Exclude known non-filament products
-        exclude_patterns = [
-            "polybox",
-            "polydryer",
-            "nebulizer",
-            "gift-card",
-            "sample-box",
-            "creator-spool",
-            "bundle",
-            "pack",
-        ]
-        url_lower = url.lower()
-        return not any(pattern in url_lower for pattern in exclude_patterns)
+        return _is_filament_url(url)
 
     def _extract_material_type(self, product_title: str) -> str:
         """Extract material type from product title"""
-        title_upper = product_title.upper()
-
-        # Map of patterns to material types
-        material_patterns = [
-            ("PLA", "PLA"),
-            ("PETG", "PETG"),
-            ("ABS", "ABS"),
-            ("ASA", "ASA"),
-            ("TPU", "TPU"),
-            ("PC", "PC"),
-            ("COPA", "PA"),
-            ("PA12", "PA12"),
-            ("PA6", "PA6"),
-            ("PA612", "PA612"),
-            ("PPS", "PPS"),
-            ("PET", "PET"),
-            ("PBT", "PBT"),
-        ]
-
-        for pattern, material in material_patterns:
-            if pattern in title_upper:
-                return material
-
-        return "PLA"  # Default to PLA for Polymaker products
+        return _material_type(product_title)
 
     def _parse_product_page(
         self, session: requests.Session, product_url: str, delay: float
@@ -185,18 +512,25 @@ class PolymakerScraper(FilamentScraper):
 
         filaments = []
 
-        # Fetch both the product JSON and the HTML page
-        json_url = f"{product_url}.json"
-        json_response = self._fetch_with_retry(session, json_url, delay)
-        html_response = self._fetch_with_retry(session, product_url, delay * 0.3)
-
-        if not json_response:
+        # The hex codes only exist in the HTML page, which usually also embeds
+        # the product JSON, so one request is enough for most products
+        html_response = self._fetch_with_retry(session, product_url, delay)
+        if not html_response:
             return filaments
 
-        try:
-            product_data = json_response.json().get("product", {})
-        except (ValueError, KeyError):
-            return filaments
+        product_data = self._extract_product_json(html_response.content)
+        if product_data is None:
+            # Theme without an inline product blob, ask the JSON endpoint instead
+            json_url = f"{product_url}.json"
+            json_response = self._fetch_with_retry(session, json_url, delay * 0.3)
+            if not json_response:
+                return filaments
+
+            try:
+                # Decode the raw bytes directly instead of going through response.text
+                product_data = _json_loads(json_response.content).get("product", {})
+            except (ValueError, KeyError, AttributeError):
+                return filaments
 
         product_title = product_data.get("title", "")
         material = self._extract_material_type(product_title)
@@ -205,22 +539,26 @@ class PolymakerScraper(FilamentScraper):
         print(f"  Processing: {product_title} ({len(variants)} variants)")
 
         # Extract variant hex codes from the HTML page metafields
-        variant_hex_map = {}
-        if html_response:
-            variant_hex_map = self._extract_variant_hex_codes(html_response.text)
+        variant_hex_map = self._extract_variant_hex_codes(html_response.content)
+
+        # No per-variant metafields: a product in a single color can still
+        # state its hex code in its own description, which then applies to
+        # every variant. The rest of the page is not searched, since CSS and
+        # other products' data there carry unrelated hex values
+        if not variant_hex_map:
+            colors = {self._variant_color(v.get("title", "")) for v in variants}
+            colors.discard(None)
+            description_hex = None
+            if len(colors) == 1:
+                description_hex = self._extract_hex_from_description(product_data)
+            if description_hex:
+                variant_hex_map = {str(v.get("id")): description_hex for v in variants}
 
         # Build variant ID to color name mapping, dedupe by color
         seen_colors = set()
         for variant in variants:
             variant_id = str(variant.get("id"))
-            # Parse color from variant title (format: "1.75mm / 1kg / Black" - color is LAST)
-            title_parts = variant.get("title", "").split(" / ")
-            # Color is typically the last part, skip size/weight parts
-            color_name = None
-            for part in reversed(title_parts):
-                if part not in ["1.75mm", "2.85mm", "1kg", "3kg", "Default Title"]:
-                    color_name = part
-                    break
+            color_name = self._variant_color(variant.get("title", ""))
 
             # Skip if no color found or already seen
             if not color_name or color_name in seen_colors:
@@ -241,43 +579,81 @@ class PolymakerScraper(FilamentScraper):
                 filaments.append(filament)
                 print(f"    Found: {color_name} -> {hex_code}")
 
+                # Every variant with a hex code has been used, nothing left to find
+                if len(seen_colors) == len(variant_hex_map):
+                    break
+
         return filaments
 
-    def _extract_variant_hex_codes(self, html: str) -> dict[str, str]:
+    def _extract_product_json(self, html: bytes) -> dict[str, Any] | None:
+        """Get the product JSON a Shopify theme embeds in its page, if any"""
+        for match in self._PRODUCT_JSON_TAG_RE.finditer(html):
+            end = html.find(b"</script>", match.end())
+            if end == -1:
+                break
+            try:
+                data = _json_loads(html[match.end() : end])
+            except ValueError:
+                continue
+            # Some themes wrap the product the same way the .json endpoint does
+            if isinstance(data, dict):
+                data = data.get("product", data)
+            if isinstance(data, dict) and "variants" in data:
+                return data
+
+        return None
+
+    def _variant_color(self, variant_title: str) -> str | None:
+        """Get the color from a variant title (format: "1.75mm / 1kg / Black")"""
+        # Color is typically the last part, skip size/weight parts
+        for part in reversed(variant_title.split(" / ")):
+            if part not in self._SIZE_PARTS:
+                return part
+        return None
+
+    def _extract_variant_hex_codes(self, html: bytes | str) -> dict[str, str]:
         """Extract hex codes for all variants from page HTML metafields"""
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+
         variant_hex_map = {}
 
-        # Pattern to find variant IDs with hex_code in metafields
         # The structure is: "variant_id": {...metafields...{..."hex_code":"#XXXXXX"...}}
-        # Use a simpler pattern that matches the variant ID followed by hex_code
-        # Variant IDs are 14+ digit numbers
-        pattern = r'"(\d{14,})"[^}]*?"hex_code"[:\s]*"(#?[0-9A-Fa-f]{6})"'
-
-        matches = re.findall(pattern, html)
+        # _VARIANT_HEX_RE matches the variant ID followed by hex_code
+        matches = self._VARIANT_HEX_RE.findall(html)
         for variant_id, hex_code in matches:
-            # Normalize hex code
-            if not hex_code.startswith("#"):
-                hex_code = f"#{hex_code}"
-            hex_code = hex_code.upper()
-            variant_hex_map[variant_id] = hex_code
+            # Only the small captured groups are decoded; both are pure ASCII
+            hex_code = hex_code.decode("ascii").lstrip("#").upper()
+            variant_hex_map[variant_id.decode("ascii")] = f"#{hex_code}"
 
         return variant_hex_map
 
-    def _extract_hex_from_page(self, html: str) -> str | None:
+    def _extract_hex_from_description(self, product_data: dict[str, Any]) -> str | None:
+        """Extract a "Hex Code" stated in the product's own description"""
+        description = product_data.get("description") or product_data.get("body_html")
+        if not isinstance(description, str):
+            return None
+
+        match = self._DESCRIPTION_HEX_RE.search(description)
+        if match:
+            return f"#{match.group(1).upper()}"
+
+        return None
+
+    def _extract_hex_from_page(self, html: bytes | str) -> str | None:
         """Extract hex code from page HTML"""
-        # Pattern 1: "Hex Code: #XXXXXX" or "HEX Code: #XXXXXX"
-        patterns = [
-            r"[Hh][Ee][Xx]\s*[Cc]ode[:\s]+#?([0-9A-Fa-f]{6})",
-            r"[Hh][Ee][Xx][:\s]+#?([0-9A-Fa-f]{6})",
-            r'"hex_code"[:\s]+"#?([0-9A-Fa-f]{6})"',
-            r'"hexCode"[:\s]+"#?([0-9A-Fa-f]{6})"',
-            r"color[_-]?hex[:\s]+#?([0-9A-Fa-f]{6})",
-        ]
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+
+        # Fold case once for all patterns; every one of them contains "hex"
+        html = html.lower()
+        if b"hex" not in html:
+            return None
 
-        for pattern in patterns:
-            match = re.search(pattern, html, re.IGNORECASE)
+        for pattern in self._HEX_PAGE_RES:
+            match = pattern.search(html)
             if match:
-                hex_value = match.group(1).upper()
+                hex_value = match.group(1).decode("ascii").upper()
                 return f"#{hex_value}"
 
         return None
@@ -286,6 +662,8 @@ class PolymakerScraper(FilamentScraper):
         self,
         delay: float = None,
         max_products: int = None,
+        concurrency: int = None,
+        cache_dir: str | Path = None,
         **kwargs,
     ) -> dict[str, Any]:
         """
@@ -294,17 +672,34 @@ class PolymakerScraper(FilamentScraper):
         Args:
             delay: Delay in seconds between requests (default: 1.0)
             max_products: Maximum number of products to fetch (for testing)
+            concurrency: Number of product pages fetched in parallel (default: 8)
+            cache_dir: Directory for an on-disk response cache; repeat runs reuse
+                fresh responses and revalidate stale ones with conditional GETs
 
         Returns:
             Dictionary containing the scraped filament data
         """
         if delay is None:
             delay = self.DEFAULT_DELAY
+        if concurrency is None:
+            concurrency = self.DEFAULT_CONCURRENCY
+        concurrency = max(1, concurrency)
 
         print("Starting Polymaker scraper...")
         print(f"Using {delay}s delay between requests...")
-
-        session = self._get_session()
+        print(f"Fetching up to {concurrency} products in parallel...")
+
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            print(f"Caching responses in {self._cache_dir}")
+
+        # Each worker has one request in flight, so the pool needs a connection
+        # per worker or they would queue on the blocking pool
+        if concurrency > self._pool_size:
+            self._pool_size = concurrency
+            self._session = None  # rebuild with a larger pool
+        session = self.session
         product_urls = self._get_product_urls(session)
 
         if max_products:
@@ -317,10 +712,18 @@ class PolymakerScraper(FilamentScraper):
             "filaments": [],
         }
 
-        for i, url in enumerate(product_urls, 1):
-            print(f"\n[{i}/{len(product_urls)}] {url}")
-            filaments = self._parse_product_page(session, url, delay)
-            filaments_data["filaments"].extend(filaments)
+        def fetch_product(index: int, url: str) -> list[dict[str, Any]]:
+            print(f"\n[{index}/{len(product_urls)}] {url}")
+            return self._parse_product_page(session, url, delay)
+
+        # Product pages are independent, so fetch them on a bounded pool; map()
+        # keeps results in sitemap order
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = executor.map(
+                fetch_product, range(1, len(product_urls) + 1), product_urls
+            )
+            for filaments in results:
+                filaments_data["filaments"].extend(filaments)
 
         print(f"\nTotal filaments found: {len(filaments_data['filaments'])}")
         return filaments_data
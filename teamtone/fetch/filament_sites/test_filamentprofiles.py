@@ -7,8 +7,9 @@ Run with: pytest teamtone/fetch/filament_sites/test_filamentprofiles.py -v
 import pytest
 from pathlib import Path
 from bs4 import BeautifulSoup
+from urllib3.response import HTTPResponse
 
-from .filamentprofiles import FilamentProfilesScraper
+from .filamentprofiles import _SESSION, FilamentProfilesScraper
 
 
 @pytest.fixture
@@ -213,3 +214,21 @@ class TestDataQuality:
             assert len(material.split()) >= 1, (
                 f"Material type seems invalid: {material}"
             )
+
+
+class TestRetry:
+    """Test the session's rate limit retries"""
+
+    def test_retry_wait_backs_off_exponentially(self, scraper):
+        """Test that even the first retry waits RETRY_DELAY"""
+        retry = _SESSION.get_adapter("https://").max_retries
+        delay = scraper.RETRY_DELAY
+
+        waits = []
+        for _ in range(scraper.MAX_RETRIES - 1):
+            retry = retry.increment(
+                "GET", "/filaments", response=HTTPResponse(status=429)
+            )
+            waits.append(retry.get_backoff_time())
+
+        assert waits == [delay, delay * 2]
@@ -4,7 +4,11 @@ Test suite for PolymakerScraper
 Run with: pytest teamtone/fetch/filament_sites/test_polymaker.py -v
 """
 
+import json
+import time
+
 import pytest
+import requests
 
 from .polymaker import PolymakerScraper
 
@@ -31,6 +35,8 @@ class TestMaterialTypeExtraction:
             ("PolyMide CoPA", "PA"),
             ("Fiberon PA12-CF10", "PA12"),
             ("Fiberon PA6-GF25", "PA6"),
+            ("Fiberon PA612-CF15", "PA612"),
+            ("PolyLite PC-ABS", "ABS"),  # Earliest listed material wins
             ("Unknown Product", "PLA"),  # Default fallback
         ],
     )
@@ -71,6 +77,19 @@ class TestHexCodeExtraction:
 
         assert result["39574341779513"] == "#ABCDEF"
 
+    def test_extract_variant_hex_codes_bytes(self, scraper):
+        """Test that raw response bytes give the same result as text"""
+        html = '"39574341779513": {"metafields": {"hex_code": "#16161A"}} ™'
+        result = scraper._extract_variant_hex_codes(html.encode("utf-8"))
+
+        assert result == scraper._extract_variant_hex_codes(html)
+        assert result == {"39574341779513": "#16161A"}
+
+    def test_extract_hex_from_page_bytes(self, scraper):
+        """Test page-level hex extraction on raw bytes"""
+        assert scraper._extract_hex_from_page(b"<p>Hex Code: #ff8800</p>") == "#FF8800"
+        assert scraper._extract_hex_from_page(b"<p>No color</p>") is None
+
     def test_extract_variant_hex_codes_empty(self, scraper):
         """Test extraction from HTML with no hex codes"""
         html = "<html><body>No hex codes here</body></html>"
@@ -79,6 +98,124 @@ class TestHexCodeExtraction:
         assert result == {}
 
 
+class TestProductJsonExtraction:
+    """Test reading the product JSON embedded in a product page"""
+
+    def test_inline_product_json(self, scraper):
+        """Test that the theme's ProductJson script is parsed"""
+        html = (
+            b'<script type="application/json" id="ProductJson-product-template">'
+            b'{"title": "PolyLite PLA", "variants": [{"id": 1, "title": "Black"}]}'
+            b"</script>"
+        )
+        result = scraper._extract_product_json(html)
+
+        assert result["title"] == "PolyLite PLA"
+        assert result["variants"] == [{"id": 1, "title": "Black"}]
+
+    def test_wrapped_product_json(self, scraper):
+        """Test a blob wrapped in "product" like the .json endpoint"""
+        html = b'<script data-product-json>{"product": {"variants": []}}</script>'
+        assert scraper._extract_product_json(html) == {"variants": []}
+
+    def test_missing_or_invalid_product_json(self, scraper):
+        """Test that pages without a usable blob return None"""
+        assert scraper._extract_product_json(b"<script>var a = 1;</script>") is None
+        html = b'<script id="ProductJson-x">{not json</script>'
+        assert scraper._extract_product_json(html) is None
+
+
+class TestParseProductPage:
+    """Test building filaments from a product page"""
+
+    URL = "https://us.polymaker.com/products/polylite-pla"
+
+    def _page(self, description):
+        """Build a single-color product page without variant metafields"""
+        product = {
+            "title": "PolyLite PLA",
+            "description": description,
+            "variants": [
+                {"id": 1, "title": "1.75mm / 1kg / Black"},
+                {"id": 2, "title": "2.85mm / 1kg / Black"},
+            ],
+        }
+        return (
+            b"<style>.swatch { hex: #123456 }</style>"
+            b'<script type="application/json" id="ProductJson-product-template">'
+            + json.dumps(product).encode("utf-8")
+            + b"</script>"
+            b'<div data-recommendations>{"hexCode": "#ABCDEF"}</div>'
+        )
+
+    def _parse(self, scraper, page):
+        """Parse the page as if it had been fetched from URL"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = page
+        scraper._fetch_with_retry = lambda session, url, delay: response
+        return scraper._parse_product_page(None, self.URL, 0)
+
+    def test_unrelated_page_hex_is_ignored(self, scraper):
+        """Test that hex values elsewhere on the page are not used"""
+        assert self._parse(scraper, self._page("<p>Matte black PLA</p>")) == []
+
+    def test_description_hex_code(self, scraper):
+        """Test that a single-color product's description hex applies"""
+        page = self._page("<p>Hex Code: #16161a</p>")
+        assert self._parse(scraper, page) == [
+            {
+                "manufacturer": "Polymaker",
+                "material": "PLA",
+                "color": "Black",
+                "hex": "#16161A",
+                "link": f"{self.URL}?variant=1",
+            }
+        ]
+
+    def test_one_filament_per_color(self, scraper):
+        """Test that each color with a metafield hex is listed once"""
+        product = {
+            "title": "PolyTerra PLA",
+            "variants": [
+                {"id": 39574341779513, "title": "1.75mm / 1kg / Black"},
+                {"id": 39574341779514, "title": "2.85mm / 1kg / Black"},
+                {"id": 39574341713977, "title": "1.75mm / 1kg / White"},
+            ],
+        }
+        page = (
+            b'<script type="application/json" id="ProductJson-product-template">'
+            + json.dumps(product).encode("utf-8")
+            + b"</script>"
+            b'"39574341779513": {"metafields": {"hex_code": "#16161A"}}'
+            b'"39574341779514": {"metafields": {"hex_code": "#16161A"}}'
+            b'"39574341713977": {"metafields": {"hex_code": "#F0EBE8"}}'
+        )
+        result = self._parse(scraper, page)
+
+        assert [(f["color"], f["hex"]) for f in result] == [
+            ("Black", "#16161A"),
+            ("White", "#F0EBE8"),
+        ]
+
+
+class TestVariantColor:
+    """Test color extraction from variant titles"""
+
+    @pytest.mark.parametrize(
+        "title,expected",
+        [
+            ("1.75mm / 1kg / Black", "Black"),
+            ("Galaxy Blue / 2.85mm", "Galaxy Blue"),
+            ("1.75mm / 3kg", None),
+            ("Default Title", None),
+        ],
+    )
+    def test_variant_color(self, scraper, title, expected):
+        """Test that size and weight parts are skipped"""
+        assert scraper._variant_color(title) == expected
+
+
 class TestFilamentProductFilter:
     """Test filtering of filament vs non-filament products"""
 
@@ -100,6 +237,61 @@ class TestFilamentProductFilter:
         assert result == expected, f"Expected {expected} for '{url}'"
 
 
+class TestSitemapParsing:
+    """Test extraction of locations from sitemap XML"""
+
+    def test_product_sitemap(self, scraper):
+        """Test that page locations are found and image locations ignored"""
+        xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+                xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+          <url>
+            <loc>https://us.polymaker.com/products/polylite-pla</loc>
+            <image:image><image:loc>https://cdn.shopify.com/a.png</image:loc></image:image>
+          </url>
+          <url><loc>https://us.polymaker.com/products/polybox</loc></url>
+        </urlset>"""
+        result = scraper._iter_sitemap_locs(xml, "url")
+
+        assert result == [
+            "https://us.polymaker.com/products/polylite-pla",
+            "https://us.polymaker.com/products/polybox",
+        ]
+
+    def test_sitemap_index(self, scraper):
+        """Test that child sitemaps are found in a sitemap index"""
+        xml = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+          <sitemap><loc>https://us.polymaker.com/sitemap_products_1.xml</loc></sitemap>
+        </sitemapindex>"""
+        result = scraper._iter_sitemap_locs(xml, "sitemap")
+
+        assert result == ["https://us.polymaker.com/sitemap_products_1.xml"]
+
+    def test_malformed_sitemap_falls_back(self, scraper):
+        """Test that malformed XML is still parsed leniently"""
+        xml = b"<urlset><url><loc>https://us.polymaker.com/products/a</loc></url>"
+        result = scraper._iter_sitemap_locs(xml, "url")
+
+        assert result == ["https://us.polymaker.com/products/a"]
+
+    def test_streamed_chunks(self, scraper):
+        """Test that a sitemap split across arbitrary chunks parses the same"""
+        xml = (
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b"<url><loc>https://us.polymaker.com/products/a</loc></url>"
+            b"<url><loc>https://us.polymaker.com/products/b</loc></url>"
+            b"</urlset>"
+        )
+        chunks = [xml[i : i + 7] for i in range(0, len(xml), 7)]
+        result = list(scraper._stream_sitemap_locs(chunks, "url"))
+
+        assert result == scraper._iter_sitemap_locs(xml, "url")
+        assert result == [
+            "https://us.polymaker.com/products/a",
+            "https://us.polymaker.com/products/b",
+        ]
+
+
 class TestScraperProperties:
     """Test scraper property methods"""
 
@@ -110,3 +302,100 @@ class TestScraperProperties:
     def test_site_url(self, scraper):
         """Test site_url property"""
         assert scraper.site_url == "https://us.polymaker.com"
+
+    def test_session_is_shared(self, scraper):
+        """Test that the session is created once and reused"""
+        assert scraper.session is scraper.session
+
+
+class TestThrottle:
+    """Test the request throttle shared by concurrent workers"""
+
+    def test_slots_are_spaced_by_delay(self, scraper):
+        """Test that consecutive request slots start at least delay apart"""
+        start = time.monotonic()
+        scraper._wait_for_slot(0.05)
+        scraper._wait_for_slot(0.05)
+        scraper._wait_for_slot(0.05)
+        assert time.monotonic() - start >= 0.1
+
+    def test_retry_wait_honors_retry_after(self, scraper):
+        """Test that a Retry-After header sets the wait and delays other workers"""
+        response = requests.Response()
+        response.headers["Retry-After"] = "2"
+
+        assert scraper._retry_wait(response, 1) == 2.0
+        assert scraper._next_request_at >= time.monotonic() + 1
+
+    def test_retry_wait_backs_off_exponentially(self, scraper):
+        """Test the jittered exponential backoff without a Retry-After header"""
+        response = requests.Response()
+        delay = scraper.RETRY_DELAY
+
+        assert delay <= scraper._retry_wait(response, 1) <= delay * 1.5
+        assert delay * 2 <= scraper._retry_wait(response, 2) <= delay * 3
+
+
+class TestResponseCache:
+    """Test the on-disk response cache"""
+
+    def test_cache_round_trip(self, scraper, tmp_path):
+        """Test that a stored response can be loaded back with its validators"""
+        scraper._cache_dir = tmp_path
+        url = "https://us.polymaker.com/products/polylite-pla.json"
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"product": {"title": "PolyLite PLA"}}'
+        response.encoding = "utf-8"
+        response.headers["ETag"] = '"abc123"'
+        response.headers["Content-Type"] = "application/json"
+        scraper._store_cached(url, response)
+
+        meta, body = scraper._load_cached(url)
+        assert meta["etag"] == '"abc123"'
+        assert body == response.content
+
+        cached = scraper._cached_response(url, meta, body)
+        assert cached.json()["product"]["title"] == "PolyLite PLA"
+
+    def test_not_modified_closes_streamed_response(self, scraper, tmp_path):
+        """Test that a 304 on a streamed fetch closes the live response"""
+        scraper._cache_dir = tmp_path
+        url = "https://us.polymaker.com/sitemap_products_1.xml"
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<urlset></urlset>"
+        response.headers["ETag"] = '"abc123"'
+        scraper._store_cached(url, response)
+        # Make the cached copy stale so the fetch revalidates it
+        meta, _ = scraper._load_cached(url)
+        meta_path, _ = scraper._cache_paths(url)
+        meta_path.write_text(json.dumps({**meta, "fetched_at": 0}), encoding="utf-8")
+
+        class NotModified(requests.Response):
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        not_modified = NotModified()
+        not_modified.status_code = 304
+
+        class Session:
+            def get(self, url, headers, timeout, stream):
+                assert headers["If-None-Match"] == '"abc123"'
+                assert stream
+                return not_modified
+
+        result = scraper._fetch_with_retry(Session(), url, 0, stream=True)
+
+        assert not_modified.closed
+        assert result is not not_modified
+        assert result.content == b"<urlset></urlset>"
+
+    def test_cache_miss(self, scraper, tmp_path):
+        """Test that an uncached URL returns None"""
+        scraper._cache_dir = tmp_path
+        assert scraper._load_cached("https://us.polymaker.com/missing") is None
@@ -8,8 +8,13 @@ Use git to review changes before committing.
 """
 
 import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -19,7 +24,32 @@ except ImportError:
     print("Install with: uv sync")
     sys.exit(1)
 
-from filament_sites import FilamentProfilesScraper, PolymakerScraper
+# Prefer libyaml's C loader and dumper, falling back to the pure-Python ones
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader
+
+from filament_sites import FilamentProfilesScraper, PolymakerScraper, fetch_all
+
+# Share teamtone's cached reader for the filaments folder when the package is
+# importable, e.g. with `python -m teamtone.fetch.scrape_filaments`
+try:
+    from teamtone.yaml_cache import load_yaml_folder_cached
+except ImportError:
+    load_yaml_folder_cached = None
+
+# Prefer orjson for the cached scrape results when it's installed
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
 
 # Available scrapers
@@ -29,13 +59,28 @@ SCRAPERS = {
     "polymaker": PolymakerScraper,
 }
 
+# Characters that aren't allowed in file names on some platforms
+_INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Snapshot file teamtone.filament_colors keeps in the filaments folder
+_FILAMENTS_CACHE_FILE = ".cache.pkl"
+
+# Pseudo-site that runs every distinct scraper concurrently
+ALL_SITES = "all"
+
+
+def unique_scraper_classes() -> list[type]:
+    """Get each scraper class once, skipping aliases"""
+    return list(dict.fromkeys(SCRAPERS.values()))
+
 
 def sanitize_filename(name: str) -> str:
     """Convert manufacturer name to valid filename"""
     # Replace invalid characters with underscore
-    name = re.sub(r'[<>:"/\\|?*]', "_", name)
+    name = name.translate(_INVALID_FILENAME_CHARS)
     # Replace spaces and other whitespace with underscore
-    name = re.sub(r"\s+", "_", name)
+    name = _WHITESPACE_RE.sub("_", name)
     # Remove leading/trailing underscores and dots
     name = name.strip("._")
     # Convert to lowercase for consistency
@@ -49,7 +94,18 @@ def load_yaml(path: Path) -> dict:
         return {}
 
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_Loader) or {}
+
+
+def dump_yaml(data: dict) -> str:
+    """Serialize data to a YAML string in the filaments/ file format"""
+    return yaml.dump(
+        data,
+        Dumper=_Dumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+    )
 
 
 def save_yaml(data: dict, path: Path) -> None:
@@ -57,9 +113,50 @@ def save_yaml(data: dict, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(
-            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
+        f.write(dump_yaml(data))
+
+
+def write_if_changed(text: str, path: Path) -> bool:
+    """
+    Write text to a file unless it already holds exactly that text
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+
+def results_cache_path(cache_dir: Path, scraper, per_page: int) -> Path:
+    """Get the file that caches a scraper's fetch() results for a page size"""
+    key = hashlib.sha256(f"{scraper.site_url}|{per_page}".encode("utf-8")).hexdigest()
+    return cache_dir / f"results-{key}.json"
+
+
+def load_cached_results(path: Path, max_age: float) -> dict | None:
+    """Load cached fetch() results, or None if missing or older than max_age seconds"""
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        return _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_results(results: dict, path: Path) -> None:
+    """Cache fetch() results, writing via a temp file so readers never see partial data"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(_json_dumps(results))
+    os.replace(tmp_path, path)
 
 
 def load_filaments_from_folder(folder: Path) -> dict:
@@ -85,54 +182,98 @@ def load_filaments_from_folder(folder: Path) -> dict:
     return all_data
 
 
-def save_filaments_to_folder(data: dict, folder: Path) -> list[Path]:
+def load_existing_filaments(folder: Path) -> dict:
+    """
+    Load the filament data already in the filaments folder
+
+    Reads the folder through teamtone's pickled snapshot, the same one
+    teamtone.filament_colors uses, so YAML files that haven't changed
+    aren't parsed again. Falls back to load_filaments_from_folder when the
+    teamtone package can't be imported.
+    """
+    if load_yaml_folder_cached is None:
+        return load_filaments_from_folder(folder)
+
+    return load_yaml_folder_cached(
+        folder, _FILAMENTS_CACHE_FILE, lambda path: load_yaml(Path(path))
+    )
+
+
+def save_filaments_to_folder(data: dict, folder: Path) -> list[tuple[Path, bool]]:
     """
     Save filament data to individual manufacturer YAML files
 
+    Files whose contents would not change are left untouched, so unchanged
+    manufacturers don't show up in git diffs or cost a write. Files are
+    serialized and written on a thread pool so file I/O overlaps.
+
     Args:
         data: Dictionary with structure {manufacturer: {material: {color: data}}}
         folder: Path to filaments folder
 
     Returns:
-        List of file paths that were written
+        List of (file path, changed) tuples, one per manufacturer file
     """
     folder.mkdir(parents=True, exist_ok=True)
-    written_files = []
 
+    # Group by file so manufacturers whose names sanitize to the same file
+    # are still written one after another, in order
+    files = {}
     for manufacturer, materials in data.items():
         # Create safe filename from manufacturer name
         filename = sanitize_filename(manufacturer) + ".yaml"
-        file_path = folder / filename
-
-        # Save this manufacturer's data
-        manufacturer_data = {manufacturer: materials}
-        save_yaml(manufacturer_data, file_path)
-        written_files.append(file_path)
-
-    return written_files
+        files.setdefault(folder / filename, []).append({manufacturer: materials})
+
+    def save_file(item: tuple[Path, list[dict]]) -> list[tuple[Path, bool]]:
+        file_path, manufacturers = item
+        return [
+            (file_path, write_if_changed(dump_yaml(manufacturer_data), file_path))
+            for manufacturer_data in manufacturers
+        ]
+
+    workers = max(1, min(8, os.cpu_count() or 4, len(files)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [
+            saved
+            for saved_file in executor.map(save_file, files.items())
+            for saved in saved_file
+        ]
+
+
+def count_colors(data: dict) -> int:
+    """Count color entries in {manufacturer: {material: {color: data}}} data"""
+    return sum(
+        len(colors) for materials in data.values() for colors in materials.values()
+    )
 
 
-def merge_filament_data(existing: dict, new: dict) -> dict:
+def merge_filament_data(existing: dict, new: dict) -> tuple[dict, int]:
     """
     Deep merge new filament data into existing data
 
     Structure: {manufacturer: {material: {color: {hex, source, temp_hotend, temp_bed}}}}
+
+    Neither input is modified; only the manufacturer and material dicts that
+    receive new colors are copied, everything else is shared with existing.
+
+    Returns:
+        Tuple of (merged data, number of colors added), so callers can get
+        the merged color count as count_colors(existing) + added without
+        walking the merged tree again
     """
     result = existing.copy()
+    added = 0
 
     for manufacturer, materials in new.items():
-        if manufacturer not in result:
-            result[manufacturer] = {}
+        merged_materials = result[manufacturer] = dict(result.get(manufacturer, {}))
 
         for material, colors in materials.items():
-            if material not in result[manufacturer]:
-                result[manufacturer][material] = {}
+            # Add or update the colors in one C-level dict merge
+            old_colors = merged_materials.get(material, {})
+            merged_colors = merged_materials[material] = {**old_colors, **colors}
+            added += len(merged_colors) - len(old_colors)
 
-            for color, data in colors.items():
-                # Add or update the color
-                result[manufacturer][material][color] = data
-
-    return result
+    return result, added
 
 
 def main():
@@ -142,9 +283,9 @@ def main():
     )
     parser.add_argument(
         "--site",
-        choices=list(SCRAPERS.keys()),
+        choices=[*SCRAPERS.keys(), ALL_SITES],
         default="filamentprofiles",
-        help="Source site to scrape (default: filamentprofiles)",
+        help=f"Source site to scrape, or '{ALL_SITES}' to scrape every site concurrently (default: filamentprofiles)",
     )
     parser.add_argument(
         "--per-page",
@@ -158,6 +299,24 @@ def main():
         default=1.0,
         help="Delay in seconds between requests to prevent rate limiting (default: 1.0)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of pages fetched in parallel, for scrapers that support it (default: scraper's own)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Cache responses in this directory and revalidate them on later runs, for scrapers that support it",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=None,
+        help="Reuse scraped results saved in --cache-dir if they are younger than this many seconds, skipping the fetch entirely",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -182,6 +341,9 @@ def main():
 
     args = parser.parse_args()
 
+    if args.max_age is not None and not args.cache_dir:
+        parser.error("--max-age requires --cache-dir")
+
     if args.list_sites:
         print("Available scraper sites:")
         seen = set()
@@ -190,6 +352,7 @@ def main():
                 instance = scraper_class()
                 print(f"  {name:20} -> {instance.site_url}")
                 seen.add(scraper_class)
+        print(f"  {ALL_SITES:20} -> every site above, fetched concurrently")
         return
 
     # Get paths
@@ -197,24 +360,58 @@ def main():
     project_root = script_dir.parent
     filaments_folder = project_root / "filaments"
 
-    # Initialize the scraper
-    scraper_class = SCRAPERS[args.site]
-    scraper = scraper_class()
-
-    print(f"Using scraper: {scraper.site_name}")
-    print(f"Site URL: {scraper.site_url}")
-
-    # Fetch the data
+    # Initialize the scrapers
+    if args.site == ALL_SITES:
+        if args.fetch_only:
+            print("Error: --fetch-only needs a single --site")
+            sys.exit(1)
+        scrapers = [scraper_class() for scraper_class in unique_scraper_classes()]
+    else:
+        scrapers = [SCRAPERS[args.site]()]
+
+    for scraper in scrapers:
+        print(f"Using scraper: {scraper.site_name}")
+        print(f"Site URL: {scraper.site_url}")
+
+    # Reuse fresh cached results instead of fetching those sites again
+    results = {}
+    use_results_cache = args.max_age is not None and not args.fetch_only
+    if use_results_cache:
+        for scraper in scrapers:
+            cache_path = results_cache_path(
+                Path(args.cache_dir), scraper, args.per_page
+            )
+            cached = load_cached_results(cache_path, args.max_age)
+            if cached is not None:
+                print(f"Using cached results for {scraper.site_name}: {cache_path}")
+                results[scraper.site_name] = cached
+    to_fetch = [scraper for scraper in scrapers if scraper.site_name not in results]
+
+    # Fetch the data; with several sites their network waits overlap
     try:
-        raw_data = scraper.fetch(
-            per_page=args.per_page, delay=args.delay, fetch_only=args.fetch_only
+        fetched = fetch_all(
+            to_fetch,
+            per_page=args.per_page,
+            delay=args.delay,
+            fetch_only=args.fetch_only,
+            concurrency=args.concurrency,
+            cache_dir=args.cache_dir,
         )
     except Exception as e:
         print(f"Error during scraping: {e}")
         sys.exit(1)
 
+    if use_results_cache:
+        for scraper in to_fetch:
+            save_cached_results(
+                fetched[scraper.site_name],
+                results_cache_path(Path(args.cache_dir), scraper, args.per_page),
+            )
+    results.update(fetched)
+
     # If fetch-only mode, dump raw HTML and exit
     if args.fetch_only:
+        raw_data = results[scrapers[0].site_name]
         output_path = Path(args.output)
         raw_html = raw_data.get("raw_html", "")
 
@@ -243,37 +440,36 @@ def main():
         print("\nYou can now inspect this file to understand the page structure.")
         return
 
-    # Convert to YAML format
-    new_data = scraper.convert_to_yaml_format(raw_data)
-
-    print(f"\nScraped {len(raw_data.get('filaments', []))} filaments")
+    # Convert to YAML format, combining sites in the order they were listed
+    new_data = {}
+    scraped_count = 0
+    total_colors = 0
+    for scraper in scrapers:
+        raw_data = results[scraper.site_name]
+        scraped_count += len(raw_data.get("filaments", []))
+        new_data, added = merge_filament_data(
+            new_data, scraper.convert_to_yaml_format(raw_data)
+        )
+        total_colors += added
 
-    # Count entries in new data
-    total_colors = sum(
-        len(colors)
-        for manufacturer in new_data.values()
-        for material in manufacturer.values()
-        for colors in [material]
-    )
+    print(f"\nScraped {scraped_count} filaments")
     print(
         f"Converted to {total_colors} color entries across {len(new_data)} manufacturers"
     )
 
     # Load existing data from folder
-    existing_data = load_filaments_from_folder(filaments_folder)
+    existing_data = load_existing_filaments(filaments_folder)
 
     # Merge
-    merged_data = merge_filament_data(existing_data, new_data)
+    merged_data, added = merge_filament_data(existing_data, new_data)
+    existing_count = count_colors(existing_data)
+    merged_count = existing_count + added
 
     if args.dry_run:
         print("\n=== DRY RUN - No files modified ===")
         print(f"\nWould update: {filaments_folder}")
-        print(
-            f"Existing entries: {sum(len(colors) for mfr in existing_data.values() for mat in mfr.values() for colors in [mat])}"
-        )
-        print(
-            f"After merge: {sum(len(colors) for mfr in merged_data.values() for mat in mfr.values() for colors in [mat])}"
-        )
+        print(f"Existing entries: {existing_count}")
+        print(f"After merge: {merged_count}")
 
         # Show what would be added
         new_manufacturers = set(new_data.keys()) - set(existing_data.keys())
@@ -290,13 +486,13 @@ def main():
         return
 
     # Save merged data to folder (one file per manufacturer)
-    written_files = save_filaments_to_folder(merged_data, filaments_folder)
+    saved_files = save_filaments_to_folder(merged_data, filaments_folder)
+    changed_count = sum(changed for _, changed in saved_files)
 
     print(f"\n[OK] Updated {filaments_folder}")
-    print(f"  Files written: {len(written_files)}")
-    print(
-        f"  Total entries: {sum(len(colors) for mfr in merged_data.values() for mat in mfr.values() for colors in [mat])}"
-    )
+    print(f"  Files written: {changed_count}")
+    print(f"  Files unchanged: {len(saved_files) - changed_count}")
+    print(f"  Total entries: {merged_count}")
     print("\nNext steps:")
     print("  git status teamtone/filaments/     # See changed files")
     print("  git diff teamtone/filaments/       # Review changes")
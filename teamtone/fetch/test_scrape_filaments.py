@@ -4,11 +4,20 @@ Test suite for FilamentProfilesScraper parser
 Run with: pytest teamtone/fetch/test_scrape_filaments.py -v
 """
 
+import os
 import pytest
 from pathlib import Path
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-from filament_sites.filamentprofiles import FilamentProfilesScraper
+from filament_sites.filamentprofiles import _HTML_PARSER, FilamentProfilesScraper
+from scrape_filaments import (
+    load_cached_results,
+    load_existing_filaments,
+    merge_filament_data,
+    sanitize_filename,
+    save_cached_results,
+    save_filaments_to_folder,
+)
 
 
 @pytest.fixture
@@ -24,8 +33,10 @@ def html_content():
 
 @pytest.fixture
 def soup(html_content):
-    """Parse HTML into BeautifulSoup object"""
-    return BeautifulSoup(html_content, "html.parser")
+    """Parse HTML into BeautifulSoup object the same way the scraper does"""
+    return BeautifulSoup(
+        html_content, _HTML_PARSER, parse_only=SoupStrainer("script")
+    )
 
 
 @pytest.fixture
@@ -140,6 +151,13 @@ class TestFilamentParser:
             f"Too many duplicates found: {len(duplicates)}"
         )
 
+    def test_raw_script_scan_matches_soup(self, scraper, html_content, filaments):
+        """Test that scanning raw HTML bytes finds the same filaments"""
+        raw_filaments = scraper._parse_filaments_from_html(
+            html_content.encode("utf-8")
+        )
+        assert raw_filaments == filaments
+
 
 class TestSpecificManufacturers:
     """Test parsing of specific manufacturers"""
@@ -217,3 +235,118 @@ class TestDataQuality:
             assert len(material.split()) >= 1, (
                 f"Material type seems invalid: {material}"
             )
+
+
+class TestMergeFilamentData:
+    """Test merging scraped data into existing filament data"""
+
+    def test_merge_adds_and_updates_colors(self):
+        """Test that new colors are added and existing ones updated in place"""
+        existing = {
+            "Polymaker": {
+                "PLA": {"Black": {"hex": "#000000"}, "Red": {"hex": "#FF0000"}}
+            },
+            "eSUN": {"PETG": {"Blue": {"hex": "#0000FF"}}},
+        }
+        new = {
+            "Polymaker": {
+                "PLA": {"Black": {"hex": "#111111"}, "White": {"hex": "#FFFFFF"}},
+                "PETG": {"Grey": {"hex": "#808080"}},
+            },
+            "Sunlu": {"PLA": {"Green": {"hex": "#00FF00"}}},
+        }
+
+        merged, added = merge_filament_data(existing, new)
+
+        assert added == 3
+        assert list(merged) == ["Polymaker", "eSUN", "Sunlu"]
+        assert list(merged["Polymaker"]["PLA"]) == ["Black", "Red", "White"]
+        assert merged["Polymaker"]["PLA"]["Black"] == {"hex": "#111111"}
+        assert merged["Polymaker"]["PETG"] == {"Grey": {"hex": "#808080"}}
+        assert merged["eSUN"] == existing["eSUN"]
+
+    def test_merge_does_not_modify_inputs(self):
+        """Test that the existing data is left untouched"""
+        existing = {"Polymaker": {"PLA": {"Black": {"hex": "#000000"}}}}
+        new = {"Polymaker": {"PLA": {"White": {"hex": "#FFFFFF"}}}}
+
+        merge_filament_data(existing, new)
+
+        assert existing == {"Polymaker": {"PLA": {"Black": {"hex": "#000000"}}}}
+
+
+class TestLoadExistingFilaments:
+    """Test reading the filament data already in the folder"""
+
+    def test_reads_current_folder_contents(self, tmp_path):
+        """Test that the data matches the folder, including after a write"""
+        data = {"Polymaker": {"PLA": {"Black": {"hex": "#000000"}}}}
+        save_filaments_to_folder(data, tmp_path)
+        assert load_existing_filaments(tmp_path) == data
+
+        data["Polymaker"]["PLA"]["Red"] = {"hex": "#FF0000"}
+        save_filaments_to_folder(data, tmp_path)
+        assert load_existing_filaments(tmp_path) == data
+
+
+class TestSanitizeFilename:
+    """Test turning manufacturer names into file names"""
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("Polymaker", "polymaker"),
+            ("Bambu Lab", "bambu_lab"),
+            ("3D-Fuel  Pro\tPLA", "3d-fuel_pro_pla"),
+            ('A<b>c:d"e/f\\g|h?i*j', "a_b_c_d_e_f_g_h_i_j"),
+            ("..Elegoo_.", "elegoo"),
+            ("?", "unknown"),
+        ],
+    )
+    def test_sanitize_filename(self, name, expected):
+        """Test that invalid characters and whitespace become underscores"""
+        assert sanitize_filename(name) == expected
+
+
+class TestSaveFilamentsToFolder:
+    """Test writing manufacturer YAML files"""
+
+    def test_unchanged_files_are_not_rewritten(self, tmp_path):
+        """Test that only manufacturers whose YAML changed are written"""
+        data = {
+            "Polymaker": {"PLA": {"Black": {"hex": "#000000"}}},
+            "eSUN": {"PETG": {"Blue": {"hex": "#0000FF"}}},
+        }
+        first = save_filaments_to_folder(data, tmp_path)
+        assert [changed for _, changed in first] == [True, True]
+
+        data["eSUN"]["PETG"]["Red"] = {"hex": "#FF0000"}
+        second = save_filaments_to_folder(data, tmp_path)
+
+        assert second == [
+            (tmp_path / "polymaker.yaml", False),
+            (tmp_path / "esun.yaml", True),
+        ]
+
+
+class TestCachedResults:
+    """Test the on-disk cache of scraped results"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that fresh cached results load back unchanged"""
+        results = {"filaments": [{"manufacturer": "Polymaker", "hex": "#000000"}]}
+        path = tmp_path / "results.json"
+
+        save_cached_results(results, path)
+
+        assert load_cached_results(path, max_age=60) == results
+
+    def test_stale_or_missing_results_are_ignored(self, tmp_path):
+        """Test that results older than max_age are not reused"""
+        path = tmp_path / "results.json"
+        assert load_cached_results(path, max_age=60) is None
+
+        save_cached_results({"filaments": []}, path)
+        os.utime(path, (0, 0))
+
+        assert load_cached_results(path, max_age=60) is None
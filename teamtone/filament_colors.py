@@ -6,33 +6,170 @@ Data sourced from FilamentColors.xyz, manufacturer websites, and Amazon.
 
 import yaml
 import os
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+# Prefer libyaml's C loader, falling back to the pure-Python one without it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    from .yaml_cache import load_yaml_folder_cached
+except ImportError:
+    from yaml_cache import load_yaml_folder_cached
 
 
 # Load filament data from filaments folder (one file per manufacturer)
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 _filaments_folder = os.path.join(_current_dir, "filaments")
 
+# Parsed copy of the folder, reused until a YAML file is added, removed or changed
+_CACHE_FILE = ".cache.pkl"
+
+
+def _load_yaml_file(yaml_file: str) -> dict:
+    """Load one manufacturer YAML file"""
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
 
 def _load_filaments_from_folder(folder: str) -> dict:
     """Load all filament data from manufacturer YAML files in the filaments folder"""
-    import glob
+    return load_yaml_folder_cached(folder, _CACHE_FILE, _load_yaml_file)
 
-    if not os.path.exists(folder):
-        return {}
 
-    all_filaments = {}
+ALL_FILAMENTS = _load_filaments_from_folder(_filaments_folder)
 
-    for yaml_file in glob.glob(os.path.join(folder, "*.yaml")):
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            manufacturer_data = yaml.safe_load(f)
-            if manufacturer_data:
-                all_filaments.update(manufacturer_data)
 
-    return all_filaments
+def _build_indexes(all_filaments: dict) -> Tuple[Dict, Dict]:
+    """
+    Build case-insensitive lookup indexes over the filament data.
 
+    When several keys only differ by case, the first one in iteration order
+    wins, matching what a linear scan would find.
 
-ALL_FILAMENTS = _load_filaments_from_folder(_filaments_folder)
+    Returns:
+        Tuple[Dict, Dict]: (lowercase manufacturer -> key, lowercase
+        manufacturer -> lowercase material -> lowercase color ->
+        (manufacturer, material, color, color_data) entry)
+    """
+    mfr_index = {}
+    lookup = {}
+
+    for mfr_key, materials in all_filaments.items():
+        mfr_lower = mfr_key.lower()
+        mfr_index.setdefault(mfr_lower, mfr_key)
+        mfr_colors = lookup.setdefault(mfr_lower, {})
+
+        for mat_key, colors in materials.items():
+            mat_colors = mfr_colors.setdefault(mat_key.lower(), {})
+
+            for color_key, color_data in colors.items():
+                entry = (mfr_key, mat_key, color_key, color_data)
+                mat_colors.setdefault(color_key.lower(), entry)
+
+    return mfr_index, lookup
+
+
+# Lowercase-keyed mirror of ALL_FILAMENTS, so lookups are three dict probes
+_MFR_INDEX, _LOOKUP = _build_indexes(ALL_FILAMENTS)
+
+
+class FilamentEntry(NamedTuple):
+    """
+    A filament color as an immutable record, returned with as_dict=False.
+
+    Fields that are missing from the data are None; use _asdict() to get a dict.
+    """
+
+    manufacturer: str
+    material: str
+    color: str
+    hex: Optional[str]
+    source: Optional[str]
+    temp_hotend: Optional[int] = None
+    temp_bed: Optional[int] = None
+    link: Optional[str] = None
+
+
+def _build_rows(
+    all_filaments: dict,
+) -> Tuple[List[Dict], List[FilamentEntry], List[str], List[str], List[str]]:
+    """
+    Flatten the filament data into rows for bulk scans.
+
+    Returns:
+        Tuple[List[Dict], List[FilamentEntry], List[str], List[str], List[str]]:
+        (result dicts as returned by search_filaments, the same rows as
+        FilamentEntry records, lowercase manufacturers, lowercase materials,
+        lowercase colors), all in the same row order
+    """
+    rows = []
+    entries = []
+    mfr_lower = []
+    mat_lower = []
+    color_lower = []
+
+    for mfr_key, materials in all_filaments.items():
+        for mat_key, colors in materials.items():
+            for color_key, color_data in colors.items():
+                row = {
+                    "manufacturer": mfr_key,
+                    "material": mat_key,
+                    "color": color_key,
+                    "hex": color_data.get("hex"),
+                    "source": color_data.get("source"),
+                }
+                if "temp_hotend" in color_data:
+                    row["temp_hotend"] = color_data["temp_hotend"]
+                if "temp_bed" in color_data:
+                    row["temp_bed"] = color_data["temp_bed"]
+                if "link" in color_data:
+                    row["link"] = color_data["link"]
+                rows.append(row)
+                entries.append(FilamentEntry(**row))
+                mfr_lower.append(mfr_key.lower())
+                mat_lower.append(mat_key.lower())
+                color_lower.append(color_key.lower())
+
+    return rows, entries, mfr_lower, mat_lower, color_lower
+
+
+# Rows are shared, so callers always get copies of them; entries are immutable
+# and returned as they are
+_ROWS, _ENTRIES, _ROW_MFR_LOWER, _ROW_MAT_LOWER, _ROW_COLOR_LOWER = _build_rows(
+    ALL_FILAMENTS
+)
+
+
+def _normalize_hex(hex_code: str) -> str:
+    """Normalize a hex code for exact matching (no # and uppercase)"""
+    return hex_code.strip("#").upper()
+
+
+def _build_hex_index(rows: List[Dict]) -> Dict[str, List[int]]:
+    """Group row indices by normalized hex code, normalizing each stored hex once"""
+    hex_index = {}
+    for i, row in enumerate(rows):
+        # Rows without a hex code can't match any lookup
+        if row["hex"] is None:
+            continue
+        hex_index.setdefault(_normalize_hex(row["hex"]), []).append(i)
+    return hex_index
+
+
+_HEX_INDEX = _build_hex_index(_ROWS)
+
+# Top-manufacturer positions within each exact-hex match list, best rank
+# first, filled in by get_top_manufacturer_positions() as hex codes are looked up
+_HEX_TOP_POSITIONS = {}
+
+# Column-wise (structure of arrays) view of filaments with hex codes, built on
+# first use by _get_hex_catalog() for vectorized color matching
+_HEX_CATALOG = None
 
 
 def get_filament_color(
@@ -49,40 +186,39 @@ def get_filament_color(
     Returns:
         Optional[Dict]: Dictionary containing color information, or None if not found
     """
-    # Normalize for case-insensitive search
-    manufacturer_lower = manufacturer.lower()
-    material_lower = material.lower()
-    color_lower = color_name.lower()
-
-    # Search for manufacturer
-    for mfr_key, materials in ALL_FILAMENTS.items():
-        if mfr_key.lower() == manufacturer_lower:
-            # Search for material type
-            for mat_key, colors in materials.items():
-                if mat_key.lower() == material_lower:
-                    # Search for color
-                    for color_key, color_data in colors.items():
-                        if color_key.lower() == color_lower:
-                            result = {
-                                "manufacturer": mfr_key,
-                                "material": mat_key,
-                                "color": color_key,
-                                "hex": color_data.get("hex"),
-                                "source": color_data.get("source"),
-                            }
-                            # Add temperature data if available
-                            if "temp_hotend" in color_data:
-                                result["temp_hotend"] = color_data["temp_hotend"]
-                            if "temp_bed" in color_data:
-                                result["temp_bed"] = color_data["temp_bed"]
-                            return result
-
-    return None
+    # Case-insensitive lookup through the lowercase-keyed mirror
+    materials = _LOOKUP.get(manufacturer.lower())
+    if not materials:
+        return None
+    colors = materials.get(material.lower())
+    if not colors:
+        return None
+    entry = colors.get(color_name.lower())
+    if entry is None:
+        return None
+
+    mfr_key, mat_key, color_key, color_data = entry
+    result = {
+        "manufacturer": mfr_key,
+        "material": mat_key,
+        "color": color_key,
+        "hex": color_data.get("hex"),
+        "source": color_data.get("source"),
+    }
+    # Add temperature data if available
+    if "temp_hotend" in color_data:
+        result["temp_hotend"] = color_data["temp_hotend"]
+    if "temp_bed" in color_data:
+        result["temp_bed"] = color_data["temp_bed"]
+    return result
 
 
 def search_filaments(
-    search_term: str, manufacturer: Optional[str] = None, material: Optional[str] = None
-) -> List[Dict]:
+    search_term: str,
+    manufacturer: Optional[str] = None,
+    material: Optional[str] = None,
+    as_dict: bool = True,
+) -> List[Dict] | List[FilamentEntry]:
     """
     Search for filaments by color name, optionally filtered by manufacturer and/or material.
 
@@ -90,43 +226,30 @@ def search_filaments(
         search_term (str): Partial color name to search for
         manufacturer (str, optional): Filter by manufacturer name
         material (str, optional): Filter by material type
+        as_dict (bool): Return dicts (default), or shared FilamentEntry records
+            that skip building a dict per match
 
     Returns:
-        List[Dict]: List of matching filaments with their information
+        List[Dict] | List[FilamentEntry]: List of matching filaments with their information
     """
     search_lower = search_term.lower()
     manufacturer_lower = manufacturer.lower() if manufacturer else None
     material_lower = material.lower() if material else None
-    results = []
 
-    for mfr_key, materials in ALL_FILAMENTS.items():
-        # Skip if manufacturer filter doesn't match
-        if manufacturer_lower and mfr_key.lower() != manufacturer_lower:
-            continue
-
-        for mat_key, colors in materials.items():
-            # Skip if material filter doesn't match
-            if material_lower and mat_key.lower() != material_lower:
-                continue
-
-            for color_key, color_data in colors.items():
-                if search_lower in color_key.lower():
-                    result = {
-                        "manufacturer": mfr_key,
-                        "material": mat_key,
-                        "color": color_key,
-                        "hex": color_data.get("hex"),
-                        "source": color_data.get("source"),
-                    }
-                    if "temp_hotend" in color_data:
-                        result["temp_hotend"] = color_data["temp_hotend"]
-                    if "temp_bed" in color_data:
-                        result["temp_bed"] = color_data["temp_bed"]
-                    if "link" in color_data:
-                        result["link"] = color_data["link"]
-                    results.append(result)
-
-    return results
+    matches = [
+        row
+        for row, mfr_lower, mat_lower, color_lower in zip(
+            _ROWS if as_dict else _ENTRIES,
+            _ROW_MFR_LOWER,
+            _ROW_MAT_LOWER,
+            _ROW_COLOR_LOWER,
+        )
+        if search_lower in color_lower
+        # Skip rows where a manufacturer or material filter doesn't match
+        and (not manufacturer_lower or mfr_lower == manufacturer_lower)
+        and (not material_lower or mat_lower == material_lower)
+    ]
+    return [dict(row) for row in matches] if as_dict else matches
 
 
 def get_manufacturer_colors(manufacturer: str, material: Optional[str] = None) -> Dict:
@@ -140,22 +263,21 @@ def get_manufacturer_colors(manufacturer: str, material: Optional[str] = None) -
     Returns:
         Dict: Dictionary of materials and their colors, or None if manufacturer not found
     """
-    manufacturer_lower = manufacturer.lower()
-    material_lower = material.lower() if material else None
-
-    for mfr_key, materials in ALL_FILAMENTS.items():
-        if mfr_key.lower() == manufacturer_lower:
-            if material_lower:
-                # Return specific material's colors
-                for mat_key, colors in materials.items():
-                    if mat_key.lower() == material_lower:
-                        return {mat_key: colors}
-                return {}
-            else:
-                # Return all materials
-                return materials
+    mfr_key = _MFR_INDEX.get(manufacturer.lower())
+    if mfr_key is None:
+        return {}
 
-    return {}
+    materials = ALL_FILAMENTS[mfr_key]
+    if material:
+        # Return specific material's colors
+        material_lower = material.lower()
+        for mat_key, colors in materials.items():
+            if mat_key.lower() == material_lower:
+                return {mat_key: colors}
+        return {}
+    else:
+        # Return all materials
+        return materials
 
 
 def list_manufacturers() -> List[str]:
@@ -179,11 +301,10 @@ def list_materials(manufacturer: Optional[str] = None) -> List[str]:
         List[str]: List of material type names
     """
     if manufacturer:
-        manufacturer_lower = manufacturer.lower()
-        for mfr_key, materials in ALL_FILAMENTS.items():
-            if mfr_key.lower() == manufacturer_lower:
-                return list(materials.keys())
-        return []
+        mfr_key = _MFR_INDEX.get(manufacturer.lower())
+        if mfr_key is None:
+            return []
+        return list(ALL_FILAMENTS[mfr_key].keys())
     else:
         # Get all unique material types across all manufacturers
         all_materials = set()
@@ -192,75 +313,171 @@ def list_materials(manufacturer: Optional[str] = None) -> List[str]:
         return sorted(list(all_materials))
 
 
-def get_filaments_with_hex() -> List[Dict]:
+def get_filaments_with_hex(as_dict: bool = True) -> List[Dict] | List[FilamentEntry]:
     """
     Get all filaments that have hex color codes defined (not null).
 
+    Args:
+        as_dict (bool): Return dicts (default), or shared FilamentEntry records
+
     Returns:
-        List[Dict]: List of filaments with hex codes
+        List[Dict] | List[FilamentEntry]: List of filaments with hex codes
     """
-    results = []
+    if as_dict:
+        return [dict(row) for row in _ROWS if row["hex"] is not None]
+    return [entry for entry in _ENTRIES if entry.hex is not None]
 
-    for mfr_key, materials in ALL_FILAMENTS.items():
-        for mat_key, colors in materials.items():
-            for color_key, color_data in colors.items():
-                if color_data.get("hex") is not None:
-                    result = {
-                        "manufacturer": mfr_key,
-                        "material": mat_key,
-                        "color": color_key,
-                        "hex": color_data["hex"],
-                        "source": color_data.get("source"),
-                    }
-                    if "temp_hotend" in color_data:
-                        result["temp_hotend"] = color_data["temp_hotend"]
-                    if "temp_bed" in color_data:
-                        result["temp_bed"] = color_data["temp_bed"]
-                    if "link" in color_data:
-                        result["link"] = color_data["link"]
-                    results.append(result)
-
-    return results
-
-
-def get_filaments_by_hex(hex_code: str) -> List[Dict]:
+
+def get_filaments_by_hex(
+    hex_code: str, as_dict: bool = True
+) -> List[Dict] | List[FilamentEntry]:
     """
     Find all filaments matching a specific hex color code (exact match).
 
     Args:
         hex_code (str): Hex color code (with or without #)
+        as_dict (bool): Return dicts (default), or FilamentEntry records
 
     Returns:
-        List[Dict]: List of matching filaments with their information
+        List[Dict] | List[FilamentEntry]: List of matching filaments with their information
     """
-    # Normalize hex code (remove # if present, convert to uppercase)
-    hex_normalized = hex_code.strip("#").upper()
+    # Normalize hex code (remove # if present, convert to uppercase); stored
+    # hex codes were normalized the same way when the index was built
+    hex_normalized = _normalize_hex(hex_code)
+    hex_value = f"#{hex_normalized}"
+    indices = _HEX_INDEX.get(hex_normalized, ())
 
-    matches = []
+    if as_dict:
+        return [{**_ROWS[i], "hex": hex_value} for i in indices]
+    return [_ENTRIES[i]._replace(hex=hex_value) for i in indices]
 
-    for mfr_key, materials in ALL_FILAMENTS.items():
-        for mat_key, colors in materials.items():
-            for color_key, color_data in colors.items():
-                # Normalize the stored hex code
-                stored_hex = color_data.get("hex", "").strip("#").upper()
-
-                if stored_hex == hex_normalized:
-                    result = {
-                        "manufacturer": mfr_key,
-                        "material": mat_key,
-                        "color": color_key,
-                        "hex": f"#{stored_hex}",
-                        "source": color_data.get("source"),
-                    }
-                    if "temp_hotend" in color_data:
-                        result["temp_hotend"] = color_data["temp_hotend"]
-                    if "temp_bed" in color_data:
-                        result["temp_bed"] = color_data["temp_bed"]
-                    if "link" in color_data:
-                        result["link"] = color_data["link"]
-                    matches.append(result)
-
-    return matches
+
+def get_top_manufacturer_positions(hex_code: str) -> List[int]:
+    """
+    Find where top-manufacturer filaments are in an exact hex match list.
+
+    Args:
+        hex_code (str): Hex color code (with or without #)
+
+    Returns:
+        List[int]: Positions in get_filaments_by_hex(hex_code) of filaments from
+        top manufacturers, best manufacturer rank first (ties in list order)
+    """
+    hex_normalized = _normalize_hex(hex_code)
+    positions = _HEX_TOP_POSITIONS.get(hex_normalized)
+
+    if positions is None:
+        try:
+            from .filament_manufacturers import get_manufacturer_rank
+        except ImportError:
+            from filament_manufacturers import get_manufacturer_rank
+
+        ranked = []
+        for position, i in enumerate(_HEX_INDEX.get(hex_normalized, ())):
+            rank = get_manufacturer_rank(_ROWS[i]["manufacturer"])
+            if rank != 999:
+                ranked.append((rank, position))
+        ranked.sort()
+        positions = _HEX_TOP_POSITIONS[hex_normalized] = [
+            position for _, position in ranked
+        ]
+
+    return positions
+
+
+def _get_hex_catalog(
+    compare_colors,
+) -> Tuple[List[Dict], Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Get filaments with hex codes as parallel columns, building them on first use.
+
+    Many filaments share a color, so LAB values are stored once per distinct
+    color and each row points at its color.
+
+    Args:
+        compare_colors: The compare_colors module, used for the LAB conversion
+
+    Returns:
+        Tuple[List[Dict], Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        (filaments, lowercased manufacturer name -> row indices, (C, 3) LAB
+        values of the distinct colors, each row's index into those colors)
+    """
+    global _HEX_CATALOG
+
+    if _HEX_CATALOG is None:
+        # Shared rows; the similarity searches copy the ones they return
+        filaments = [row for row in _ROWS if row["hex"] is not None]
+
+        # Each manufacturer's rows, so filtered searches skip the mask
+        groups = {}
+        for i, f in enumerate(filaments):
+            groups.setdefault(f["manufacturer"].lower(), []).append(i)
+        manufacturer_indices = {
+            name: np.array(indices, dtype=np.intp) for name, indices in groups.items()
+        }
+
+        rgb = np.array(
+            [compare_colors.hex_to_rgb(f["hex"]) for f in filaments], dtype=np.uint8
+        ).reshape(-1, 3)
+        color_rgb, row_colors = np.unique(rgb, axis=0, return_inverse=True)
+        color_labs = compare_colors.rgb_to_lab_np(color_rgb)
+        _HEX_CATALOG = (
+            filaments,
+            manufacturer_indices,
+            color_labs,
+            row_colors.reshape(-1),
+        )
+
+    return _HEX_CATALOG
+
+
+def _catalog_similarities(
+    compare_colors, target_hex: str, manufacturer: Optional[str]
+) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+    """
+    Score catalog filaments against a target color in one vectorized pass.
+
+    Args:
+        compare_colors: The compare_colors module
+        target_hex (str): Target hex color to match
+        manufacturer (str, optional): Only score this manufacturer's filaments
+
+    Returns:
+        Tuple[List[Dict], np.ndarray, np.ndarray]: (catalog filaments, indices
+        of the scored filaments, their similarity percentages)
+    """
+    filaments, manufacturer_indices, color_labs, row_colors = _get_hex_catalog(
+        compare_colors
+    )
+
+    if manufacturer:
+        indices = manufacturer_indices.get(manufacturer.lower(), np.empty(0, np.intp))
+        # A single manufacturer's rows are scored directly
+        candidate_labs = color_labs[row_colors[indices]]
+    else:
+        indices = np.arange(len(filaments))
+        # Score each distinct color once and spread the scores over the rows
+        candidate_labs = color_labs
+
+    if not len(indices):
+        return filaments, indices, np.empty(0)
+
+    # Delta E (CIE76) from the target to every candidate, turned into
+    # 100 * (1 - distance / 100) clipped at 0 like color_similarity_percentage,
+    # in place to avoid a temporary array per step
+    target_lab = np.asarray(
+        compare_colors.rgb_to_lab(*compare_colors.hex_to_rgb(target_hex))
+    )
+    similarities = compare_colors.batched_delta_e(target_lab, candidate_labs)[0]
+    similarities /= 100.0
+    np.subtract(1, similarities, out=similarities)
+    similarities *= 100
+    np.maximum(similarities, 0, out=similarities)
+
+    if not manufacturer:
+        similarities = similarities[row_colors]
+
+    return filaments, indices, similarities
 
 
 def find_similar_filament_color(
@@ -285,29 +502,14 @@ def find_similar_filament_color(
         except ImportError:
             raise ImportError("compare_colors module is required for color matching")
 
-    filaments = get_filaments_with_hex()
-
-    if manufacturer:
-        manufacturer_lower = manufacturer.lower()
-        filaments = [
-            f for f in filaments if f["manufacturer"].lower() == manufacturer_lower
-        ]
-
-    if not filaments:
+    filaments, indices, similarities = _catalog_similarities(
+        compare_colors, target_hex, manufacturer
+    )
+    if not len(indices):
         return None
 
-    best_match = None
-    best_similarity = -1
-
-    for filament in filaments:
-        similarity = compare_colors.color_similarity_percentage(
-            target_hex, filament["hex"]
-        )
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match = filament
-
-    return (best_match, best_similarity) if best_match else None
+    best = int(np.argmax(similarities))
+    return (dict(filaments[indices[best]]), float(similarities[best]))
 
 
 def find_similar_filament_colors(
@@ -333,28 +535,23 @@ def find_similar_filament_colors(
         except ImportError:
             raise ImportError("compare_colors module is required for color matching")
 
-    filaments = get_filaments_with_hex()
-
-    if manufacturer:
-        manufacturer_lower = manufacturer.lower()
-        filaments = [
-            f for f in filaments if f["manufacturer"].lower() == manufacturer_lower
-        ]
-
-    if not filaments:
-        return []
-
-    # Calculate similarity for all filaments
-    matches = []
-    for filament in filaments:
-        similarity = compare_colors.color_similarity_percentage(
-            target_hex, filament["hex"]
-        )
-        matches.append((filament, similarity))
-
-    # Sort by similarity (descending) and return top N
-    matches.sort(key=lambda x: x[1], reverse=True)
-    return matches[:limit]
+    filaments, indices, similarities = _catalog_similarities(
+        compare_colors, target_hex, manufacturer
+    )
+
+    # Sort by similarity (descending, ties keep catalog order) and return top N
+    if 0 < limit < len(similarities):
+        # Partial selection: only rows at least as good as the limit-th best
+        # score get sorted, which keeps ties at the cut-off in catalog order
+        threshold = -np.partition(-similarities, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(similarities >= threshold)
+        order = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        order = order[:limit]
+    else:
+        order = np.argsort(-similarities, kind="stable")[:limit]
+    return [
+        (dict(filaments[indices[i]]), float(similarities[i])) for i in order.tolist()
+    ]
 
 
 # Example usage
@@ -4,7 +4,9 @@ Utilities for working with filament manufacturers.
 """
 
 import os
+import re
 import yaml
+from functools import lru_cache
 
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 _manufacturers_file = os.path.join(_current_dir, "filament_manufacturers.yaml")
@@ -20,6 +22,53 @@ try:
 except FileNotFoundError:
     TOP_MANUFACTURERS = []
 
+# Lowercase top manufacturers, in rank order
+_TOP_LOWER = tuple(top_mfr.lower() for top_mfr in TOP_MANUFACTURERS)
+
+# Finds every top manufacturer inside a name in one pass: the lookahead lets
+# matches overlap, and since alternatives are tried in rank order, each
+# position yields the best-ranked manufacturer starting there
+_TOP_OVERLAP_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _TOP_LOWER)) + "))"
+)
+
+# 1-indexed rank of each lowercase top manufacturer, built in reverse so the
+# first of two equal names wins
+_TOP_NAME_RANK = {
+    top_lower: rank for rank, top_lower in reversed(list(enumerate(_TOP_LOWER, 1)))
+}
+
+# Best rank of every substring of a top manufacturer (the empty one included),
+# to check whether a name appears inside any of them with a single lookup;
+# built in reverse so the best rank is written last
+_TOP_SUBSTRING_RANK = {
+    top_lower[start:end]: rank
+    for rank, top_lower in reversed(list(enumerate(_TOP_LOWER, 1)))
+    for start in range(len(top_lower) + 1)
+    for end in range(start, len(top_lower) + 1)
+}
+
+# Shortest top manufacturer name, to skip the scan when none can fit inside
+_TOP_MIN_LENGTH = min(map(len, _TOP_LOWER), default=0)
+
+
+def _match_rank(manufacturer_lower: str) -> int:
+    """
+    Find the best rank of a top manufacturer that appears inside the name or
+    that the name appears inside, or 999 if there is none
+    """
+    rank = _TOP_SUBSTRING_RANK.get(manufacturer_lower, 999)
+    if len(manufacturer_lower) >= _TOP_MIN_LENGTH:
+        matches = _TOP_OVERLAP_RE.findall(manufacturer_lower)
+        for top_lower in matches:
+            rank = min(rank, _TOP_NAME_RANK[top_lower])
+    return rank
+
+
+# Rank of each top manufacturer's own name, computed with the same matching so
+# an earlier entry that is a substring still wins
+_TOP_RANK = {top_lower: _match_rank(top_lower) for top_lower in _TOP_LOWER}
+
 
 def is_top_manufacturer(manufacturer: str) -> bool:
     """
@@ -31,15 +80,11 @@ def is_top_manufacturer(manufacturer: str) -> bool:
     Returns:
         bool: True if the manufacturer is in the top 10 list
     """
-    if not TOP_MANUFACTURERS:
-        return False
-    manufacturer_lower = manufacturer.lower()
-    return any(
-        top_mfr.lower() in manufacturer_lower or manufacturer_lower in top_mfr.lower()
-        for top_mfr in TOP_MANUFACTURERS
-    )
+    # Shares get_manufacturer_rank's matching and cache
+    return get_manufacturer_rank(manufacturer) != 999
 
 
+@lru_cache(maxsize=4096)
 def get_manufacturer_rank(manufacturer: str) -> int:
     """
     Get the rank of a manufacturer in the top manufacturers list.
@@ -53,7 +98,7 @@ def get_manufacturer_rank(manufacturer: str) -> int:
     if not TOP_MANUFACTURERS:
         return 999
     manufacturer_lower = manufacturer.lower()
-    for i, top_mfr in enumerate(TOP_MANUFACTURERS):
-        if top_mfr.lower() in manufacturer_lower or manufacturer_lower in top_mfr.lower():
-            return i + 1  # 1-indexed rank
-    return 999
+    rank = _TOP_RANK.get(manufacturer_lower)
+    if rank is not None:
+        return rank
+    return _match_rank(manufacturer_lower)
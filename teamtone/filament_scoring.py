@@ -3,7 +3,12 @@ Filament Scoring
 Utilities for scoring and ranking filament matches based on similarity and manufacturer preference.
 """
 
-from .filament_manufacturers import get_manufacturer_rank
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from .filament_manufacturers import TOP_MANUFACTURERS, get_manufacturer_rank
 
 # Multiplier for manufacturer rank bonus
 # (11 - rank) * RANK_MULTIPLIER gives the bonus points
@@ -11,7 +16,31 @@ from .filament_manufacturers import get_manufacturer_rank
 # This means a 95% similar #1 manufacturer just beats a 100% similar #10 manufacturer
 RANK_MULTIPLIER = 0.56
 
-
+# Bonus indexed by rank, with 0 standing for non-top manufacturers, as a tuple
+# for scalar lookups and an array for batch ones; the multiplier is applied
+# here once and every other table reads the folded values
+_RANK_BONUSES = (0.0,) + tuple(
+    (11 - rank) * RANK_MULTIPLIER for rank in range(1, len(TOP_MANUFACTURERS) + 1)
+)
+_BONUS_BY_RANK = np.array(_RANK_BONUSES)
+
+# Bonus of each top manufacturer by lowercase name, so exact names skip the
+# substring matching in get_manufacturer_rank (keys are interned)
+_BONUS_BY_LOWER = {
+    sys.intern(top_mfr.lower()): _RANK_BONUSES[get_manufacturer_rank(top_mfr)]
+    for top_mfr in TOP_MANUFACTURERS
+}
+
+# Lowercase top manufacturer names in sorted order, with the rank of each, for
+# exact-name lookups across a whole batch with np.searchsorted
+_SORTED_KEYS = np.array(sorted(_BONUS_BY_LOWER), dtype=str)
+_SORTED_RANKS = np.array(
+    [get_manufacturer_rank(top_lower) for top_lower in _SORTED_KEYS.tolist()],
+    dtype=np.intp,
+)
+
+
+@lru_cache(maxsize=4096)
 def calculate_manufacturer_bonus(manufacturer: str) -> float:
     """
     Calculate the bonus score for a manufacturer based on their rank.
@@ -22,10 +51,13 @@ def calculate_manufacturer_bonus(manufacturer: str) -> float:
     Returns:
         float: Bonus points (0 if not in top manufacturers)
     """
+    bonus = _BONUS_BY_LOWER.get(manufacturer.lower())
+    if bonus is not None:
+        return bonus
     rank = get_manufacturer_rank(manufacturer)
     if rank == 999:
         return 0.0
-    return (11 - rank) * RANK_MULTIPLIER
+    return _RANK_BONUSES[rank]
 
 
 def calculate_weighted_score(similarity: float, manufacturer: str) -> float:
@@ -39,8 +71,95 @@ def calculate_weighted_score(similarity: float, manufacturer: str) -> float:
     Returns:
         float: Combined weighted score
     """
-    manufacturer_bonus = calculate_manufacturer_bonus(manufacturer)
-    return similarity + manufacturer_bonus
+    # The bonus is cached per manufacturer; caching whole (similarity,
+    # manufacturer) pairs costs more to hash than the addition it saves
+    return similarity + calculate_manufacturer_bonus(manufacturer)
+
+
+def calculate_weighted_scores(similarities, manufacturers) -> np.ndarray:
+    """
+    Calculate weighted scores for many matches at once.
+
+    Args:
+        similarities (np.ndarray): Color similarity percentages (0-100)
+        manufacturers (list): Manufacturer name of each match
+
+    Returns:
+        np.ndarray: Combined weighted scores, one per match
+    """
+    bonuses = np.fromiter(
+        map(calculate_manufacturer_bonus, manufacturers),
+        dtype=np.float64,
+        count=len(manufacturers),
+    )
+    return np.asarray(similarities, dtype=np.float64) + bonuses
+
+
+def compute_ranks_batch(manufacturers) -> np.ndarray:
+    """
+    Get the rank codes of many manufacturers at once.
+
+    Args:
+        manufacturers (list): Manufacturer name of each match
+
+    Returns:
+        np.ndarray: Rank (1-10) of each manufacturer, 0 for non-top manufacturers
+    """
+    lowered = np.array([m.lower() for m in manufacturers], dtype=str)
+    ranks = np.zeros(len(lowered), dtype=np.intp)
+    hit = np.zeros(len(lowered), dtype=bool)
+    if _SORTED_KEYS.size:
+        index = np.searchsorted(_SORTED_KEYS, lowered)
+        index = np.minimum(index, _SORTED_KEYS.size - 1)
+        hit = _SORTED_KEYS[index] == lowered
+        ranks[hit] = _SORTED_RANKS[index[hit]]
+
+    # Names that aren't exactly a top manufacturer may still contain one
+    for i in np.flatnonzero(~hit).tolist():
+        rank = get_manufacturer_rank(manufacturers[i])
+        if rank != 999:
+            ranks[i] = rank
+    return ranks
+
+
+def score_all_matches(similarities, rank_codes) -> np.ndarray:
+    """
+    Calculate weighted scores for many matches at once.
+
+    Args:
+        similarities (np.ndarray): Color similarity percentages (0-100)
+        rank_codes (np.ndarray): Manufacturer ranks (1-10), 0 for non-top manufacturers
+
+    Returns:
+        np.ndarray: Combined weighted scores, one per match
+    """
+    rank_codes = np.asarray(rank_codes, dtype=np.intp)
+    return np.asarray(similarities, dtype=np.float64) + _BONUS_BY_RANK[rank_codes]
+
+
+def get_best_top_manufacturer_index(
+    similarities, rank_codes, displayed_mask
+) -> int | None:
+    """
+    Find the best match from top manufacturers in batch arrays.
+
+    Args:
+        similarities (np.ndarray): Color similarity percentages (0-100)
+        rank_codes (np.ndarray): Manufacturer ranks (1-10), 0 for non-top manufacturers
+        displayed_mask (np.ndarray): True for matches already displayed
+
+    Returns:
+        int: Index of the best match (the first one on ties), or None if no matches
+    """
+    rank_codes = np.asarray(rank_codes, dtype=np.intp)
+    scores = score_all_matches(similarities, rank_codes)
+    scores[(rank_codes == 0) | np.asarray(displayed_mask, dtype=bool)] = -np.inf
+    if not scores.size:
+        return None
+    best_index = int(np.argmax(scores))
+    if scores[best_index] == -np.inf:
+        return None
+    return best_index
 
 
 def get_best_top_manufacturer_match(matches: list, displayed: list = None) -> tuple:
@@ -48,31 +167,34 @@ def get_best_top_manufacturer_match(matches: list, displayed: list = None) -> tu
     Find the best match from top manufacturers using weighted scoring.
 
     Args:
-        matches (list): List of (filament, similarity) tuples
+        matches (list): List of (filament, similarity) tuples, where each filament
+            is a dict or a FilamentEntry record
         displayed (list): Optional list of already displayed filaments to exclude
+            (the same objects as in matches, compared by identity)
 
     Returns:
         tuple: (filament, similarity) of best match, or (None, None) if no matches
     """
-    if displayed is None:
-        displayed = []
-
-    from .filament_manufacturers import is_top_manufacturer
-
-    # Filter for top manufacturers not already displayed
-    top_mfr_matches = [
-        (filament, similarity)
-        for filament, similarity in matches
-        if filament not in displayed
-        and is_top_manufacturer(filament["manufacturer"])
-    ]
-
-    if not top_mfr_matches:
-        return None, None
-
-    # Find best match using weighted score
-    best_match = max(
-        top_mfr_matches,
-        key=lambda m: calculate_weighted_score(m[1], m[0]["manufacturer"])
-    )
+    # Filament dicts are unhashable, so look displayed ones up by identity
+    displayed_ids = {id(filament) for filament in displayed or ()}
+
+    # Find best match using weighted score in one pass, skipping matches that
+    # are already displayed or not from a top manufacturer (first match wins ties);
+    # the cached rank covers both the top check and the bonus
+    best_match = (None, None)
+    best_score = None
+    for filament, similarity in matches:
+        if id(filament) in displayed_ids:
+            continue
+        if isinstance(filament, dict):
+            manufacturer = filament["manufacturer"]
+        else:
+            manufacturer = filament.manufacturer
+        rank = get_manufacturer_rank(manufacturer)
+        if rank == 999:
+            continue
+        score = similarity + _RANK_BONUSES[rank]
+        if best_score is None or score > best_score:
+            best_match = (filament, similarity)
+            best_score = score
     return best_match
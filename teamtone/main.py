@@ -3,15 +3,27 @@ TeamTone - Main CLI
 Interactive script to match team colors with 3D printing filaments
 """
 
+import heapq
+import sys
+from functools import lru_cache
+from operator import itemgetter
+
 from . import team_colors
 from . import filament_colors
-from .filament_manufacturers import is_top_manufacturer, get_manufacturer_rank
+from .filament_manufacturers import is_top_manufacturer
 from .filament_scoring import (
     get_best_top_manufacturer_match,
     calculate_manufacturer_bonus,
-    calculate_weighted_score,
 )
 
+# Similar color matching needs the compare_colors module
+try:
+    from . import compare_colors  # noqa: F401
+
+    HAS_COMPARE_COLORS = True
+except ImportError:
+    HAS_COMPARE_COLORS = False
+
 # Maximum number of filament suggestions to display per color
 MAX_SUGGESTIONS = 3
 # Minimum number of similar matches to show when no exact matches found
@@ -92,35 +104,83 @@ def select_team(league):
             print("Please enter a valid number, 'b' to go back, or 'q' to quit")
 
 
+@lru_cache(maxsize=1024)
+def _format_details(temp_hotend, temp_bed, link):
+    """Format the temperature and purchase link suffix of a suggestion row"""
+    details = ""
+    if temp_hotend and temp_bed:
+        details = f" (Hotend: {temp_hotend}C, Bed: {temp_bed}C)"
+    if link:
+        details += f" [{link}]"
+    return details
+
+
+def _format_row(filament, similarity=None, rank_bonus=None):
+    """
+    Format one filament suggestion as an indented list row
+
+    Similar (non-exact) matches also show their hex code and similarity, plus
+    the rank bonus when one is given.
+    """
+    parts = [
+        f"    - {filament['manufacturer']} - {filament['material']} - {filament['color']}"
+    ]
+    if similarity is not None:
+        parts.append(f" - {filament['hex']} ({similarity:.1f}% similar")
+        if rank_bonus is not None:
+            parts.append(f" + {rank_bonus:.1f} rank bonus")
+        parts.append(")")
+    # The same filaments come up again across colors and teams, so their
+    # details are formatted once
+    parts.append(
+        _format_details(
+            filament.get("temp_hotend"), filament.get("temp_bed"), filament.get("link")
+        )
+    )
+    return "".join(parts)
+
+
 def display_team_colors(team_name, league):
     """Display team colors and find matching filaments"""
     print_header(f"{team_name} ({league})")
 
+    # Collect the report and write it in one call rather than a print per line,
+    # still writing what was collected if a lookup fails partway through
+    lines = []
+    try:
+        _collect_team_colors(team_name, league, lines.append)
+    finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _collect_team_colors(team_name, league, emit):
+    """Emit the team color and matching filament lines for a team"""
     # Get team color data
     team_data = team_colors.get_team_colors(team_name, league)
 
     if not team_data:
-        print(f"Could not find color data for {team_name}")
+        emit(f"Could not find color data for {team_name}")
         return
 
     colors = team_data.get("colors", [])
     hex_codes = team_data.get("hex", [])
 
     if not colors or not hex_codes:
-        print(f"{team_name} has no color data available")
+        emit(f"{team_name} has no color data available")
         return
 
-    print("\nTeam Colors:")
+    emit("\nTeam Colors:")
     for color, hex_code in zip(colors, hex_codes):
-        print(f"  - {color}: {hex_code}")
+        emit(f"  - {color}: {hex_code}")
 
     # Find matching filaments for each color
-    print("\n" + "-" * 70)
-    print("Matching Filaments:")
-    print("-" * 70)
+    emit("\n" + "-" * 70)
+    emit("Matching Filaments:")
+    emit("-" * 70)
 
     for color, hex_code in zip(colors, hex_codes):
-        print(f"\n{color} ({hex_code}):")
+        emit(f"\n{color} ({hex_code}):")
 
         # Find exact matches
         matches = filament_colors.get_filaments_by_hex(hex_code)
@@ -130,11 +190,11 @@ def display_team_colors(team_name, league):
             display_matches = matches[:MAX_SUGGESTIONS]
 
             if total_matches > MAX_SUGGESTIONS:
-                print(
+                emit(
                     f"  Found {total_matches} exact match(es), showing top {MAX_SUGGESTIONS}:"
                 )
             else:
-                print(f"  Found {total_matches} exact match(es):")
+                emit(f"  Found {total_matches} exact match(es):")
 
             # Check if any of the top matches have links
             has_link = any(match.get("link") for match in display_matches)
@@ -143,36 +203,14 @@ def display_team_colors(team_name, league):
             displayed_matches = list(display_matches)
 
             for match in display_matches:
-                manufacturer = match["manufacturer"]
-                material = match["material"]
-                color_name = match["color"]
-                temps = ""
-                if match.get("temp_hotend") and match.get("temp_bed"):
-                    temps = (
-                        f" (Hotend: {match['temp_hotend']}C, Bed: {match['temp_bed']}C)"
-                    )
-
-                link = ""
-                if match.get("link"):
-                    link = f" [{match['link']}]"
-
-                print(f"    - {manufacturer} - {material} - {color_name}{temps}{link}")
+                emit(_format_row(match))
 
             # If none of the top matches have links, find the first one with a link
             if not has_link:
                 for match in matches[MAX_SUGGESTIONS:]:
                     if match.get("link"):
-                        manufacturer = match["manufacturer"]
-                        material = match["material"]
-                        color_name = match["color"]
-                        temps = ""
-                        if match.get("temp_hotend") and match.get("temp_bed"):
-                            temps = f" (Hotend: {match['temp_hotend']}C, Bed: {match['temp_bed']}C)"
-
-                        print("\n  First exact match with purchase link:")
-                        print(
-                            f"    - {manufacturer} - {material} - {color_name}{temps} [{match['link']}]"
-                        )
+                        emit("\n  First exact match with purchase link:")
+                        emit(_format_row(match))
                         displayed_matches.append(match)
                         break
 
@@ -182,47 +220,41 @@ def display_team_colors(team_name, league):
                 for match in displayed_matches
             )
             if not has_top_manufacturer:
-                # Find all top manufacturer matches and pick the highest-ranked one
-                top_matches = [
-                    match for match in matches
-                    if match not in displayed_matches and is_top_manufacturer(match["manufacturer"])
-                ]
-                if top_matches:
-                    # Sort by manufacturer rank (lowest rank = highest priority)
-                    best_match = min(top_matches, key=lambda m: get_manufacturer_rank(m["manufacturer"]))
-                    manufacturer = best_match["manufacturer"]
-                    material = best_match["material"]
-                    color_name = best_match["color"]
-                    temps = ""
-                    if best_match.get("temp_hotend") and best_match.get("temp_bed"):
-                        temps = f" (Hotend: {best_match['temp_hotend']}C, Bed: {best_match['temp_bed']}C)"
-
-                    link = ""
-                    if best_match.get("link"):
-                        link = f" [{best_match['link']}]"
-
-                    print("\n  Nearest exact match from top manufacturer:")
-                    print(
-                        f"    - {manufacturer} - {material} - {color_name}{temps}{link}"
-                    )
+                # Pick the highest-ranked top manufacturer match that isn't shown
+                # yet (lowest rank = highest priority, first match wins ties);
+                # displayed matches are the same dicts, so compare identities
+                displayed_ids = {id(match) for match in displayed_matches}
+                best_match = None
+                for position in filament_colors.get_top_manufacturer_positions(hex_code):
+                    if id(matches[position]) not in displayed_ids:
+                        best_match = matches[position]
+                        break
+                if best_match is not None:
+                    emit("\n  Nearest exact match from top manufacturer:")
+                    emit(_format_row(best_match))
         else:
-            print("  No exact matches found")
+            emit("  No exact matches found")
 
-            # Try to find similar colors
-            try:
+            # Find similar colors when color matching is available
+            if HAS_COMPARE_COLORS:
                 # Fetch more matches and re-sort by weighted score (similarity + manufacturer rank)
                 all_matches = filament_colors.find_similar_filament_colors(
                     hex_code, limit=50
                 )
-                # Sort by weighted score (similarity + manufacturer bonus)
-                all_matches.sort(
-                    key=lambda m: calculate_weighted_score(m[1], m[0]["manufacturer"]),
-                    reverse=True,
-                )
-                similar_matches = all_matches[:MIN_SUGGESTIONS]
+                # Score each match once (similarity + manufacturer bonus), keeping
+                # the bonus for display, and only order the few that are shown;
+                # nlargest keeps ties in similarity order like a stable sort
+                scored = []
+                for filament, similarity in all_matches:
+                    rank_bonus = calculate_manufacturer_bonus(filament["manufacturer"])
+                    scored.append((similarity + rank_bonus, filament, similarity, rank_bonus))
+                similar_scored = heapq.nlargest(MIN_SUGGESTIONS, scored, key=itemgetter(0))
+                similar_matches = [
+                    (filament, similarity) for _, filament, similarity, _ in similar_scored
+                ]
 
                 if similar_matches:
-                    print(f"  Closest {len(similar_matches)} match(es) (weighted by manufacturer rank):")
+                    emit(f"  Closest {len(similar_matches)} match(es) (weighted by manufacturer rank):")
 
                     # Check if any of the top matches have links
                     has_link = any(
@@ -232,50 +264,33 @@ def display_team_colors(team_name, league):
                     # Track displayed matches for top manufacturer check
                     displayed_filaments = [filament for filament, _ in similar_matches]
 
-                    for filament, similarity in similar_matches:
-                        manufacturer = filament["manufacturer"]
-                        material = filament["material"]
-                        color_name = filament["color"]
-                        rank_bonus = calculate_manufacturer_bonus(manufacturer)
-                        temps = ""
-                        if filament.get("temp_hotend") and filament.get("temp_bed"):
-                            temps = f" (Hotend: {filament['temp_hotend']}C, Bed: {filament['temp_bed']}C)"
-
-                        link = ""
-                        if filament.get("link"):
-                            link = f" [{filament['link']}]"
-
-                        score_info = f"({similarity:.1f}% similar"
-                        if rank_bonus > 0:
-                            score_info += f" + {rank_bonus:.1f} rank bonus"
-                        score_info += ")"
-
-                        print(
-                            f"    - {manufacturer} - {material} - {color_name} - {filament['hex']} {score_info}{temps}{link}"
+                    for _, filament, similarity, rank_bonus in similar_scored:
+                        emit(
+                            _format_row(
+                                filament,
+                                similarity,
+                                rank_bonus if rank_bonus > 0 else None,
+                            )
                         )
 
-                    # If none of the top matches have links, find the nearest one with a link
+                    # If none of the top matches have links, find the best-scored
+                    # one with a link (the first one on ties)
                     if not has_link:
-                        for filament, similarity in all_matches:
-                            if (
-                                filament.get("link")
-                                and filament not in displayed_filaments
-                            ):
-                                manufacturer = filament["manufacturer"]
-                                material = filament["material"]
-                                color_name = filament["color"]
-                                temps = ""
-                                if filament.get("temp_hotend") and filament.get(
-                                    "temp_bed"
-                                ):
-                                    temps = f" (Hotend: {filament['temp_hotend']}C, Bed: {filament['temp_bed']}C)"
-
-                                print("\n  Nearest match with purchase link:")
-                                print(
-                                    f"    - {manufacturer} - {material} - {color_name} - {filament['hex']} ({similarity:.1f}% similar){temps} [{filament['link']}]"
-                                )
-                                displayed_filaments.append(filament)
-                                break
+                        link_match = max(
+                            (
+                                entry
+                                for entry in scored
+                                if entry[1].get("link")
+                                and entry[1] not in displayed_filaments
+                            ),
+                            key=itemgetter(0),
+                            default=None,
+                        )
+                        if link_match is not None:
+                            _, filament, similarity, _ = link_match
+                            emit("\n  Nearest match with purchase link:")
+                            emit(_format_row(filament, similarity))
+                            displayed_filaments.append(filament)
 
                     # If none of the displayed matches are from top 10, find best weighted match
                     has_top_manufacturer = any(
@@ -287,27 +302,11 @@ def display_team_colors(team_name, league):
                             all_matches, displayed_filaments
                         )
                         if filament:
-                            manufacturer = filament["manufacturer"]
-                            material = filament["material"]
-                            color_name = filament["color"]
-                            temps = ""
-                            if filament.get("temp_hotend") and filament.get(
-                                "temp_bed"
-                            ):
-                                temps = f" (Hotend: {filament['temp_hotend']}C, Bed: {filament['temp_bed']}C)"
-
-                            link = ""
-                            if filament.get("link"):
-                                link = f" [{filament['link']}]"
-
-                            rank_bonus = calculate_manufacturer_bonus(manufacturer)
-                            print("\n  Nearest match from top manufacturer:")
-                            print(
-                                f"    - {manufacturer} - {material} - {color_name} - {filament['hex']} ({similarity:.1f}% similar + {rank_bonus:.1f} rank bonus){temps}{link}"
+                            rank_bonus = calculate_manufacturer_bonus(
+                                filament["manufacturer"]
                             )
-            except ImportError:
-                # compare_colors module not available
-                pass
+                            emit("\n  Nearest match from top manufacturer:")
+                            emit(_format_row(filament, similarity, rank_bonus))
 
 
 def main():
@@ -6,27 +6,65 @@ Returns team color names and hex codes for major sports leagues.
 import yaml
 from pathlib import Path
 
+# Prefer libyaml's C loader, falling back to the pure-Python one without it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    from .yaml_cache import load_yaml_folder_cached
+except ImportError:
+    from yaml_cache import load_yaml_folder_cached
+
 # Load team data from teams folder (one file per league)
 _current_dir = Path(__file__).parent
 _teams_folder = _current_dir / "teams"
 
+# Parsed copy of the folder, reused until a YAML file is added, removed or changed
+_CACHE_FILE = ".cache.pkl"
+
+
+def _load_yaml_file(yaml_file: str) -> dict:
+    """Load one league YAML file"""
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
 
 def _load_teams_from_folder(folder: Path) -> dict:
     """Load all team data from league YAML files in the teams folder"""
-    if not folder.exists():
-        return {}
+    return load_yaml_folder_cached(folder, _CACHE_FILE, _load_yaml_file)
+
+
+ALL_TEAMS = _load_teams_from_folder(_teams_folder)
 
-    all_teams = {}
 
-    for yaml_file in folder.glob("*.yaml"):
-        league_data = yaml.safe_load(open(yaml_file, "r", encoding="utf-8"))
-        if league_data:
-            all_teams.update(league_data)
+def _build_team_indexes(all_teams: dict) -> tuple[dict, dict]:
+    """
+    Build case-insensitive team name indexes over the team data.
 
-    return all_teams
+    When several teams share a lowercase name, the first one in iteration
+    order wins, matching what a linear scan would find.
 
+    Returns:
+        tuple[dict, dict]: (lowercase team -> (team, league, colors) across all
+        leagues, league -> lowercase team -> (team, league, colors))
+    """
+    team_index = {}
+    league_index = {}
 
-ALL_TEAMS = _load_teams_from_folder(_teams_folder)
+    for league_name, teams in all_teams.items():
+        league_teams = league_index.setdefault(league_name, {})
+        for team, colors in teams.items():
+            entry = (team, league_name, colors)
+            team_index.setdefault(team.lower(), entry)
+            league_teams.setdefault(team.lower(), entry)
+
+    return team_index, league_index
+
+
+# Lowercase-keyed mirrors of ALL_TEAMS, so name lookups are dict probes
+_TEAM_INDEX, _LEAGUE_TEAM_INDEX = _build_team_indexes(ALL_TEAMS)
 
 
 def get_team_colors(team_name, league=None):
@@ -45,29 +83,21 @@ def get_team_colors(team_name, league=None):
 
     if league:
         # Search in specific league
-        league_upper = league.upper()
-        if league_upper in ALL_TEAMS:
-            for team, colors in ALL_TEAMS[league_upper].items():
-                if team.lower() == team_name_lower:
-                    return {
-                        "team": team,
-                        "league": league_upper,
-                        "colors": colors["colors"],
-                        "hex": colors["hex"],
-                    }
+        entry = _LEAGUE_TEAM_INDEX.get(league.upper(), {}).get(team_name_lower)
     else:
         # Search across all leagues
-        for league_name, teams in ALL_TEAMS.items():
-            for team, colors in teams.items():
-                if team.lower() == team_name_lower:
-                    return {
-                        "team": team,
-                        "league": league_name,
-                        "colors": colors["colors"],
-                        "hex": colors["hex"],
-                    }
-
-    return None
+        entry = _TEAM_INDEX.get(team_name_lower)
+
+    if entry is None:
+        return None
+
+    team, league_name, colors = entry
+    return {
+        "team": team,
+        "league": league_name,
+        "colors": colors["colors"],
+        "hex": colors["hex"],
+    }
 
 
 def search_teams(search_term):
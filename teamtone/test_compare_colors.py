@@ -0,0 +1,180 @@
+"""
+Test suite for compare_colors module
+
+Run with: pytest teamtone/test_compare_colors.py -v
+"""
+
+import numpy as np
+import pytest
+
+from teamtone.compare_colors import (
+    batched_delta_e,
+    color_similarity_percentage,
+    compare_colors,
+    delta_e_cie76,
+    delta_e_cie94,
+    euclidean_distance_rgb,
+    find_closest_color,
+    find_closest_colors,
+    hex_to_rgb,
+    rgb_to_lab,
+    rgb_to_lab_np,
+    weighted_rgb_distance,
+)
+
+
+PALETTE = [
+    ("Lakers Gold", "#FDB927"),
+    ("Celtics Green", "#007A33"),
+    ("Kings Purple", "#5A2D81"),
+    ("Black", "#000000"),
+    ("White", "#FFFFFF"),
+    ("Multi", "#FF0000,#00FF00"),
+]
+
+
+class TestHexToRgb:
+    """Test hex parsing"""
+
+    def test_with_and_without_hash(self):
+        """Should parse the same color with or without a leading #"""
+        assert hex_to_rgb("#552583") == (85, 37, 131)
+        assert hex_to_rgb("552583") == (85, 37, 131)
+
+    def test_repeated_calls_are_stable(self):
+        """Cached results should not change between calls"""
+        assert hex_to_rgb("#FDB927") == hex_to_rgb("#FDB927") == (253, 185, 39)
+
+
+class TestRgbToLabNp:
+    """Test the vectorized LAB conversion"""
+
+    def test_matches_scalar_conversion(self):
+        """Each row should match rgb_to_lab for the same color"""
+        rgb = np.array([hex_to_rgb(hex_color) for _, hex_color in PALETTE])
+        lab = rgb_to_lab_np(rgb)
+
+        assert lab.shape == (len(PALETTE), 3)
+        for row, (r, g, b) in zip(lab, rgb):
+            assert row == pytest.approx(rgb_to_lab(int(r), int(g), int(b)))
+
+
+class TestBatchedDeltaE:
+    """Test the many-to-many Delta E kernel"""
+
+    def test_matches_pairwise_delta_e(self):
+        """Each cell should equal delta_e_cie76 for that pair"""
+        targets = ["#552583", "#FDB927", "#007A33"]
+        target_labs = [rgb_to_lab(*hex_to_rgb(h)) for h in targets]
+        palette_labs = [rgb_to_lab(*hex_to_rgb(h)) for _, h in PALETTE]
+
+        distances = batched_delta_e(np.array(target_labs), np.array(palette_labs))
+
+        assert distances.shape == (len(targets), len(PALETTE))
+        for i, target in enumerate(targets):
+            for j, (_, hex_color) in enumerate(PALETTE):
+                assert distances[i, j] == pytest.approx(
+                    delta_e_cie76(target, hex_color)
+                )
+
+
+class TestColorSimilarityPercentage:
+    """Test color_similarity_percentage"""
+
+    @pytest.mark.parametrize(
+        "method", ["delta_e_cie76", "delta_e_cie94", "rgb", "weighted_rgb"]
+    )
+    def test_identical_colors_are_100_percent(self, method):
+        """Identical colors should be 100% similar with every method"""
+        assert color_similarity_percentage("#552583", "#552583", method) == 100
+
+    def test_rgb_black_vs_white(self):
+        """Opposite corners of the RGB cube should be ~0% similar"""
+        assert color_similarity_percentage(
+            "#000000", "#FFFFFF", "rgb"
+        ) == pytest.approx(0.0, abs=0.01)
+
+    def test_unknown_method_raises(self):
+        """Should raise ValueError for an unknown method name"""
+        with pytest.raises(ValueError, match="Unknown method"):
+            color_similarity_percentage("#000000", "#FFFFFF", "cmyk")
+
+
+class TestCompareColors:
+    """Test the combined compare_colors metrics"""
+
+    @pytest.mark.parametrize(
+        "hex1,hex2",
+        [("#552583", "#FDB927"), ("#007A33", "#007A33"), ("#000000", "#FFFFFF")],
+    )
+    def test_matches_individual_metrics(self, hex1, hex2):
+        """Each metric should match its standalone function"""
+        result = compare_colors(hex1, hex2)
+
+        assert result["rgb_distance"] == pytest.approx(
+            euclidean_distance_rgb(hex1, hex2)
+        )
+        assert result["weighted_rgb_distance"] == pytest.approx(
+            weighted_rgb_distance(hex1, hex2)
+        )
+        assert result["delta_e_cie76"] == pytest.approx(delta_e_cie76(hex1, hex2))
+        assert result["delta_e_cie94"] == pytest.approx(delta_e_cie94(hex1, hex2))
+        assert result["similarity_percentage"] == pytest.approx(
+            color_similarity_percentage(hex1, hex2, "delta_e_cie76")
+        )
+
+
+class TestFindClosestColor:
+    """Test find_closest_color"""
+
+    def test_returns_none_for_empty_list(self):
+        """Should return None when there is nothing to match against"""
+        assert find_closest_color("#552583", []) is None
+
+    def test_finds_closest_color(self):
+        """Lakers purple should match the Kings purple"""
+        name, hex_color, similarity = find_closest_color("#552583", PALETTE)
+        assert name == "Kings Purple"
+        assert hex_color == "#5A2D81"
+        assert similarity == pytest.approx(
+            color_similarity_percentage("#552583", "#5A2D81")
+        )
+
+    @pytest.mark.parametrize(
+        "target", ["#552583", "#FDB927", "#123456", "#FEFEFE", "#00FF00"]
+    )
+    def test_matches_scalar_search(self, target):
+        """Should pick the same color as a scalar scan of the palette"""
+        expected = max(PALETTE, key=lambda c: color_similarity_percentage(target, c[1]))
+        name, hex_color, _ = find_closest_color(target, PALETTE)
+        assert (name, hex_color) == expected
+
+    def test_exact_match_is_100_percent(self):
+        """An exact palette color should be 100% similar"""
+        name, _, similarity = find_closest_color("#007A33", PALETTE)
+        assert name == "Celtics Green"
+        assert similarity == pytest.approx(100.0)
+
+
+class TestFindClosestColors:
+    """Test find_closest_colors"""
+
+    def test_returns_empty_list_for_empty_palette(self):
+        """Should return no matches when there is nothing to match against"""
+        assert find_closest_colors("#552583", []) == []
+
+    def test_sorted_best_first(self):
+        """Matches should be ordered by decreasing similarity"""
+        matches = find_closest_colors("#552583", PALETTE, k=3)
+
+        assert len(matches) == 3
+        assert matches[0][:2] == find_closest_color("#552583", PALETTE)[:2]
+        similarities = [similarity for _, _, similarity in matches]
+        assert similarities == sorted(similarities, reverse=True)
+
+    def test_k_larger_than_palette(self):
+        """Should return every color when k exceeds the palette size"""
+        matches = find_closest_colors("#552583", PALETTE, k=50)
+        assert sorted(name for name, _, _ in matches) == sorted(
+            name for name, _ in PALETTE
+        )
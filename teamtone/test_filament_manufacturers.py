@@ -165,6 +165,30 @@ class TestGetManufacturerRank:
         """Should return correct rank for partial matches"""
         assert get_manufacturer_rank(manufacturer) == expected_rank
 
+    @pytest.mark.parametrize(
+        "manufacturer,expected_rank",
+        [
+            ("Sunlu x Polymaker", 1),
+            ("Colorfabb Hatchbox Collab", 2),
+            ("Atomic Filament by Eryone", 9),
+        ],
+    )
+    def test_best_rank_wins_when_several_match(self, manufacturer, expected_rank):
+        """A name containing several top manufacturers gets the best rank"""
+        assert get_manufacturer_rank(manufacturer) == expected_rank
+
+    @pytest.mark.parametrize(
+        "manufacturer,expected_rank",
+        [
+            ("Sun", 3),
+            ("Prusa", 4),
+            ("Matter", 7),
+        ],
+    )
+    def test_name_inside_top_manufacturer(self, manufacturer, expected_rank):
+        """A name inside a top manufacturer's name gets the first such rank"""
+        assert get_manufacturer_rank(manufacturer) == expected_rank
+
     def test_empty_string_matches_first_due_to_substring_logic(self):
         """Empty string matches first manufacturer because '' in 'polymaker' is True"""
         # Note: This is a quirk of the substring matching logic
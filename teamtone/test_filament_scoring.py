@@ -4,16 +4,32 @@ Test suite for filament_scoring module
 Run with: pytest teamtone/test_filament_scoring.py -v
 """
 
+import numpy as np
 import pytest
 
+from teamtone.filament_colors import FilamentEntry
+from teamtone.filament_manufacturers import get_manufacturer_rank
 from teamtone.filament_scoring import (
     RANK_MULTIPLIER,
     calculate_manufacturer_bonus,
     calculate_weighted_score,
+    calculate_weighted_scores,
+    compute_ranks_batch,
+    get_best_top_manufacturer_index,
     get_best_top_manufacturer_match,
+    score_all_matches,
 )
 
 
+@pytest.fixture(scope="module")
+def top_mfr_filaments():
+    """Filaments from the #1 and #10 top manufacturers, shared across tests"""
+    return {
+        "polymaker": FilamentEntry("Polymaker", "PLA", "Red", "#FF0000", None),
+        "atomic": FilamentEntry("Atomic Filament", "PLA", "Red", "#FF0000", None),
+    }
+
+
 class TestRankMultiplier:
     """Test the rank multiplier constant produces expected behavior"""
 
@@ -48,7 +64,7 @@ class TestCalculateManufacturerBonus:
     def test_top_manufacturer_bonus(self, manufacturer, expected_rank, expected_bonus):
         """Test bonus calculation for each top manufacturer"""
         bonus = calculate_manufacturer_bonus(manufacturer)
-        assert bonus == pytest.approx(expected_bonus, rel=1e-2)
+        assert bonus == expected_bonus
 
     def test_non_top_manufacturer_gets_zero_bonus(self):
         """Non-top manufacturers should get zero bonus"""
@@ -61,6 +77,16 @@ class TestCalculateManufacturerBonus:
         assert calculate_manufacturer_bonus("polymaker") == polymaker_bonus
         assert calculate_manufacturer_bonus("POLYMAKER") == polymaker_bonus
 
+    def test_repeated_calls_are_stable(self):
+        """Cached results should not change between calls"""
+        for manufacturer in ["Polymaker", "Polymaker Pro", "Unknown Brand"]:
+            assert calculate_manufacturer_bonus(
+                manufacturer
+            ) == calculate_manufacturer_bonus(manufacturer)
+        assert (
+            calculate_manufacturer_bonus("Polymaker Pro") == (11 - 1) * RANK_MULTIPLIER
+        )
+
 
 class TestCalculateWeightedScore:
     """Test weighted score calculation"""
@@ -70,7 +96,7 @@ class TestCalculateWeightedScore:
         # Polymaker bonus is 5.6
         score = calculate_weighted_score(90.0, "Polymaker")
         expected = 90.0 + (11 - 1) * RANK_MULTIPLIER
-        assert score == pytest.approx(expected, rel=1e-2)
+        assert score == expected
 
     def test_non_top_manufacturer_score_equals_similarity(self):
         """Non-top manufacturer score should equal raw similarity"""
@@ -90,6 +116,106 @@ class TestCalculateWeightedScore:
         assert polymaker_score < atomic_score
 
 
+class TestCalculateWeightedScores:
+    """Test batch weighted score calculation by manufacturer name"""
+
+    def test_matches_scalar_scores(self):
+        """Each score should equal calculate_weighted_score for that match"""
+        similarities = [95.0, 100.0, 85.5, 90.0]
+        manufacturers = ["Polymaker", "Atomic Filament", "Unknown Brand", "POLYMAKER PRO"]
+
+        scores = calculate_weighted_scores(np.array(similarities), manufacturers)
+
+        expected = [
+            calculate_weighted_score(s, m) for s, m in zip(similarities, manufacturers)
+        ]
+        assert scores.tolist() == expected
+
+
+class TestComputeRanksBatch:
+    """Test batch rank lookup"""
+
+    def test_matches_scalar_ranks(self):
+        """Each code should be the manufacturer's rank, or 0 for non-top ones"""
+        manufacturers = [
+            "Polymaker",
+            "atomic filament",
+            "ESUN",
+            "Unknown Brand",
+            "Polymaker Pro",
+            "zzz",
+        ]
+
+        ranks = compute_ranks_batch(manufacturers)
+
+        expected = [get_manufacturer_rank(m) for m in manufacturers]
+        assert ranks.tolist() == [0 if rank == 999 else rank for rank in expected]
+
+    def test_empty_batch(self):
+        """Should return an empty array for no manufacturers"""
+        assert compute_ranks_batch([]).shape == (0,)
+
+
+class TestScoreAllMatches:
+    """Test batch weighted score calculation"""
+
+    def test_matches_scalar_scores(self):
+        """Each score should equal calculate_weighted_score for that match"""
+        matches = [
+            (95.0, "Polymaker"),
+            (100.0, "Atomic Filament"),
+            (85.5, "Unknown Brand"),
+            (90.0, "eSUN"),
+        ]
+        similarities = np.array([similarity for similarity, _ in matches])
+        rank_codes = np.array(
+            [
+                0 if rank == 999 else rank
+                for rank in (get_manufacturer_rank(m) for _, m in matches)
+            ]
+        )
+
+        scores = score_all_matches(similarities, rank_codes)
+
+        expected = [calculate_weighted_score(s, m) for s, m in matches]
+        assert scores.tolist() == expected
+
+    def test_empty_batch(self):
+        """Should return an empty array for no matches"""
+        assert score_all_matches([], []).shape == (0,)
+
+
+class TestGetBestTopManufacturerIndex:
+    """Test finding the best weighted match in batch arrays"""
+
+    def test_matches_dict_api(self):
+        """Should pick the same match as get_best_top_manufacturer_match"""
+        matches = [
+            ({"manufacturer": "Unknown Brand", "color": "Red"}, 100.0),
+            ({"manufacturer": "Atomic Filament", "color": "Red"}, 99.0),
+            ({"manufacturer": "Polymaker", "color": "Red"}, 95.0),
+            ({"manufacturer": "Hatchbox", "color": "Red"}, 96.0),
+        ]
+        displayed = [matches[2][0]]
+        ranks = [get_manufacturer_rank(f["manufacturer"]) for f, _ in matches]
+
+        index = get_best_top_manufacturer_index(
+            np.array([similarity for _, similarity in matches]),
+            np.array([0 if rank == 999 else rank for rank in ranks]),
+            np.array([f is displayed[0] for f, _ in matches]),
+        )
+
+        assert matches[index] == get_best_top_manufacturer_match(matches, displayed)
+
+    def test_returns_none_when_all_filtered_out(self):
+        """Should return None when no top manufacturer match is left"""
+        assert get_best_top_manufacturer_index([], [], []) is None
+        assert (
+            get_best_top_manufacturer_index([95.0, 90.0], [1, 0], [True, False])
+            is None
+        )
+
+
 class TestGetBestTopManufacturerMatch:
     """Test finding best weighted match from top manufacturers"""
 
@@ -109,57 +235,74 @@ class TestGetBestTopManufacturerMatch:
         assert filament is None
         assert similarity is None
 
-    def test_picks_higher_ranked_manufacturer_at_equal_similarity(self):
-        """Should pick higher-ranked manufacturer when similarity is equal"""
-        matches = [
-            ({"manufacturer": "Atomic Filament", "color": "Red"}, 90.0),
-            ({"manufacturer": "Polymaker", "color": "Red"}, 90.0),
-        ]
-        filament, similarity = get_best_top_manufacturer_match(matches)
-        assert filament["manufacturer"] == "Polymaker"
-        assert similarity == 90.0
-
-    def test_picks_95_polymaker_over_100_atomic(self):
-        """Should pick 95% Polymaker over 100% Atomic"""
+    @pytest.mark.parametrize(
+        "atomic_similarity,polymaker_similarity,expected_mfr,expected_sim",
+        [
+            # Higher-ranked manufacturer wins at equal similarity
+            (90.0, 90.0, "Polymaker", 90.0),
+            # 95% Polymaker beats 100% Atomic
+            (100.0, 95.0, "Polymaker", 95.0),
+            # 100% Atomic beats 90% Polymaker (similarity wins)
+            (100.0, 90.0, "Atomic Filament", 100.0),
+        ],
+    )
+    def test_picks_best_weighted_match(
+        self,
+        top_mfr_filaments,
+        atomic_similarity,
+        polymaker_similarity,
+        expected_mfr,
+        expected_sim,
+    ):
+        """Should pick the match with the best similarity + rank bonus"""
         matches = [
-            ({"manufacturer": "Atomic Filament", "color": "Red"}, 100.0),
-            ({"manufacturer": "Polymaker", "color": "Red"}, 95.0),
+            (top_mfr_filaments["atomic"], atomic_similarity),
+            (top_mfr_filaments["polymaker"], polymaker_similarity),
         ]
         filament, similarity = get_best_top_manufacturer_match(matches)
-        assert filament["manufacturer"] == "Polymaker"
-        assert similarity == 95.0
+        assert filament.manufacturer == expected_mfr
+        assert similarity == expected_sim
 
-    def test_picks_100_atomic_over_90_polymaker(self):
-        """Should pick 100% Atomic over 90% Polymaker (similarity wins)"""
-        matches = [
-            ({"manufacturer": "Atomic Filament", "color": "Red"}, 100.0),
-            ({"manufacturer": "Polymaker", "color": "Red"}, 90.0),
-        ]
-        filament, similarity = get_best_top_manufacturer_match(matches)
-        assert filament["manufacturer"] == "Atomic Filament"
-        assert similarity == 100.0
+    def test_first_match_wins_ties(self):
+        """Should keep the earliest match when weighted scores are equal"""
+        first = FilamentEntry("Polymaker", "PLA", "Red", "#FF0000", None)
+        second = FilamentEntry("Polymaker", "PETG", "Red", "#FF0000", None)
+        filament, similarity = get_best_top_manufacturer_match(
+            [(first, 90.0), (second, 90.0)]
+        )
+        assert filament is first
+        assert similarity == 90.0
 
-    def test_excludes_displayed_filaments(self):
+    def test_excludes_displayed_filaments(self, top_mfr_filaments):
         """Should exclude already displayed filaments"""
-        polymaker_filament = {"manufacturer": "Polymaker", "color": "Red"}
-        atomic_filament = {"manufacturer": "Atomic Filament", "color": "Red"}
+        polymaker_filament = top_mfr_filaments["polymaker"]
         matches = [
             (polymaker_filament, 95.0),
-            (atomic_filament, 90.0),
+            (top_mfr_filaments["atomic"], 90.0),
         ]
         # Exclude the Polymaker filament
         filament, similarity = get_best_top_manufacturer_match(
             matches, displayed=[polymaker_filament]
         )
-        assert filament["manufacturer"] == "Atomic Filament"
+        assert filament.manufacturer == "Atomic Filament"
         assert similarity == 90.0
 
-    def test_returns_none_when_all_filtered_out(self):
+    def test_returns_none_when_all_filtered_out(self, top_mfr_filaments):
         """Should return (None, None) when all matches are filtered out"""
-        polymaker_filament = {"manufacturer": "Polymaker", "color": "Red"}
+        polymaker_filament = top_mfr_filaments["polymaker"]
         matches = [(polymaker_filament, 95.0)]
         filament, similarity = get_best_top_manufacturer_match(
             matches, displayed=[polymaker_filament]
         )
         assert filament is None
         assert similarity is None
+
+    def test_accepts_filament_dicts(self):
+        """Should read the manufacturer from filament dicts as well as records"""
+        matches = [
+            ({"manufacturer": "Atomic Filament", "color": "Red"}, 90.0),
+            ({"manufacturer": "Polymaker", "color": "Red"}, 90.0),
+        ]
+        filament, similarity = get_best_top_manufacturer_match(matches)
+        assert filament == {"manufacturer": "Polymaker", "color": "Red"}
+        assert similarity == 90.0
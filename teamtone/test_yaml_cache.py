@@ -0,0 +1,65 @@
+"""
+Test suite for yaml_cache module
+
+Run with: pytest teamtone/test_yaml_cache.py -v
+"""
+
+import os
+
+import yaml
+
+from teamtone.yaml_cache import load_yaml_folder_cached
+
+
+def _load_file(path):
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+class TestLoadYamlFolderCached:
+    """Test loading a YAML folder through its pickled snapshot"""
+
+    def test_merges_files_and_reuses_snapshot(self, tmp_path):
+        """Should merge every file and serve repeat loads from the snapshot"""
+        (tmp_path / "a.yaml").write_text("A: 1\n", encoding="utf-8")
+        (tmp_path / "b.yaml").write_text("B: 2\n", encoding="utf-8")
+
+        assert load_yaml_folder_cached(tmp_path, ".cache.pkl", _load_file) == {
+            "A": 1,
+            "B": 2,
+        }
+        assert (tmp_path / ".cache.pkl").exists()
+
+        def fail(path):
+            raise AssertionError(f"{path} was parsed again")
+
+        assert load_yaml_folder_cached(tmp_path, ".cache.pkl", fail) == {
+            "A": 1,
+            "B": 2,
+        }
+
+    def test_restored_older_file_invalidates_snapshot(self, tmp_path):
+        """Should reparse when a file changes without raising the newest mtime"""
+        old = tmp_path / "a.yaml"
+        new = tmp_path / "b.yaml"
+        old.write_text("A: 1\n", encoding="utf-8")
+        new.write_text("B: 2\n", encoding="utf-8")
+        os.utime(old, ns=(1_000_000_000, 1_000_000_000))
+        os.utime(new, ns=(2_000_000_000, 2_000_000_000))
+        load_yaml_folder_cached(tmp_path, ".cache.pkl", _load_file)
+
+        # Like a checkout or cp -p restoring an older copy of the file
+        old.write_text("A: 10\n", encoding="utf-8")
+        os.utime(old, ns=(1_500_000_000, 1_500_000_000))
+
+        assert load_yaml_folder_cached(tmp_path, ".cache.pkl", _load_file) == {
+            "A": 10,
+            "B": 2,
+        }
+
+    def test_missing_folder(self, tmp_path):
+        """Should return an empty dict for a folder that doesn't exist"""
+        assert (
+            load_yaml_folder_cached(tmp_path / "missing", ".cache.pkl", _load_file)
+            == {}
+        )
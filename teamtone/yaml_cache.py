@@ -0,0 +1,72 @@
+"""
+YAML Folder Cache
+Loads a folder of YAML files through a pickled snapshot of the merged data.
+"""
+
+import glob
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+
+def load_yaml_folder_cached(folder, cache_name: str, load_file) -> dict:
+    """
+    Load and merge every YAML file in a folder, reusing a pickled snapshot.
+
+    The snapshot is stored in the folder and reused until a YAML file is
+    added, removed or changed.
+
+    Args:
+        folder (str | Path): Folder holding the YAML files
+        cache_name (str): File name of the snapshot inside the folder
+        load_file (callable): Parses one YAML file into a dict
+
+    Returns:
+        dict: Data of every file, merged in glob order
+    """
+    if not os.path.exists(folder):
+        return {}
+
+    # Name, size and modification time of every file, so replacing or
+    # restoring any one of them invalidates the snapshot, not just a newer
+    # latest mtime; this only needs a stat per file
+    yaml_files = glob.glob(os.path.join(folder, "*.yaml"))
+    cache_key = tuple(
+        (os.path.basename(path), stat.st_size, stat.st_mtime_ns)
+        for path, stat in zip(yaml_files, map(os.stat, yaml_files))
+    )
+    cache_path = os.path.join(folder, cache_name)
+
+    # The key is pickled ahead of the data so a stale cache is rejected cheaply
+    try:
+        with open(cache_path, "rb") as f:
+            if pickle.load(f) == cache_key:
+                return pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    merged = {}
+
+    # Read and parse files on a thread pool so file I/O overlaps with parsing,
+    # then merge in glob order on this thread
+    workers = max(1, min(8, os.cpu_count() or 4, len(yaml_files)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for data in executor.map(load_file, yaml_files):
+            if data:
+                merged.update(data)
+
+    # Write via a temp file so concurrent imports never read a partial cache;
+    # read-only installs just parse the YAML every time
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache_key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(merged, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return merged